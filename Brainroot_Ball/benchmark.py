@@ -0,0 +1,50 @@
+import argparse
+import time
+import numpy as np
+from circle import Circle
+from ball import Ball
+from swarm import BallSwarm
+
+
+def balls_per_second(step, count, frames):
+    step()  # warm-up
+    start = time.perf_counter()
+    for _ in range(frames):
+        step()
+    elapsed = time.perf_counter() - start
+    return count * frames / elapsed
+
+
+def bench_ball_loop(circle, count, frames):
+    balls = [Ball(circle) for _ in range(count)]
+
+    def step():
+        for ball in balls:
+            ball.update()
+    return balls_per_second(step, count, frames)
+
+
+def bench_swarm(circle, count, frames, collide=False):
+    swarm = BallSwarm(circle, count, rng=np.random.default_rng(0), collide=collide)
+    return balls_per_second(swarm.update, count, frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ball loop vs BallSwarm throughput")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--collide", action="store_true", help="include ball-ball collisions in BallSwarm")
+    args = parser.parse_args()
+
+    circle = Circle((400, 400), 300)
+    print(f"{'balls':>8} {'Ball loop [balls/s]':>20} {'BallSwarm [balls/s]':>20} {'speedup':>8}")
+    for count in args.counts:
+        # Keep the slow path to roughly the same amount of work per row
+        loop_frames = max(1, args.frames * 1000 // max(count, 1000))
+        loop = bench_ball_loop(circle, count, loop_frames)
+        swarm = bench_swarm(circle, count, args.frames, args.collide)
+        print(f"{count:>8} {loop:>20,.0f} {swarm:>20,.0f} {swarm / loop:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
+import numpy as np
 import pygame
 
 class Circle:
     def __init__(self, center, radius):
         self.center = center
         self.radius = radius
+        self.area = np.pi * radius**2
         self.inner_color = pygame.Color("#2f2f2f")
         self.border_color = pygame.Color("#ffb633")
 
-    def draw(self, screen):
+    def draw(self, screen, border=True):
         pygame.draw.circle(screen, self.inner_color, self.center, self.radius)
-        pygame.draw.circle(screen, self.border_color, self.center, self.radius, 3)
\ No newline at end of file
+        if border:
+            pygame.draw.circle(screen, self.border_color, self.center, self.radius, 3)
+
+    def query(self, x, y):
+        # Exact signed distance to the wall (negative inside) and outward normal
+        dx = np.asarray(x, dtype=float) - self.center[0]
+        dy = np.asarray(y, dtype=float) - self.center[1]
+        distance = np.hypot(dx, dy)
+        length = np.where(distance == 0, 1.0, distance)
+        return distance - self.radius, dx / length, dy / length
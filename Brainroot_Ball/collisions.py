@@ -0,0 +1,170 @@
+# collisions.py
+import numpy as np
+
+# Half of the 3x3 neighbourhood (own cell + 4 neighbours), so every pair of
+# cells is visited once
+NEIGHBOUR_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+# The whole 3x3 neighbourhood, for pairs between two different sets of balls
+ALL_OFFSETS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+
+class GridLevel:
+    # Balls `index` sorted by the cell their centre falls in
+    def __init__(self, x, y, index, cell_size, origin_x, origin_y):
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.width = int((y.max() - origin_y) // cell_size) + 3
+        self.index = index
+        self.keys = self.cells(x[index], y[index])
+        order = np.argsort(self.keys, kind="stable")
+        self.sorted_keys = self.keys[order]
+        self.order = index[order]
+
+    def cells(self, x, y):
+        gx = np.floor((x - self.origin_x) / self.cell_size).astype(np.int64) + 1
+        gy = np.floor((y - self.origin_y) / self.cell_size).astype(np.int64) + 1
+        return gx * self.width + gy
+
+    def pairs(self, keys, index, offsets, same):
+        # Every ball of `index` (in cells `keys`) against the balls of this
+        # level in the cells around it. same: `index` is this level's own
+        # balls, so each pair in one cell is kept once.
+        first = []
+        second = []
+        for dx, dy in offsets:
+            target = keys + (dx * self.width + dy)
+            start = np.searchsorted(self.sorted_keys, target, side="left")
+            end = np.searchsorted(self.sorted_keys, target, side="right")
+            counts = end - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            i = np.repeat(index, counts)
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = self.order[np.repeat(start, counts) + within]
+            if same and dx == 0 and dy == 0:
+                keep = i < j
+                i, j = i[keep], j[keep]
+            first.append(i)
+            second.append(j)
+        return first, second
+
+
+class SpatialGrid:
+    # Two levels. The fine grid has cells one typical (median) ball diameter
+    # wide and holds every ball that fits in a cell. Balls grown larger than
+    # that go into a coarse grid with cells one largest-ball diameter wide.
+    # A few big balls then cost a few extra pairs each, instead of making the
+    # cells huge for everyone.
+    def __init__(self):
+        self.cell_size = 0.0
+        self.fine = None
+        self.coarse = None
+        self.x = None
+        self.y = None
+
+    def build(self, x, y, size):
+        self.cell_size = max(2.0 * float(np.median(size)), 1.0)
+        origin_x = float(x.min())
+        origin_y = float(y.min())
+        large = 2.0 * size > self.cell_size
+        self.fine = GridLevel(x, y, np.flatnonzero(~large), self.cell_size, origin_x, origin_y)
+        self.coarse = None
+        if large.any():
+            coarse_size = max(2.0 * float(size.max()), 1.0)
+            self.coarse = GridLevel(x, y, np.flatnonzero(large), coarse_size, origin_x, origin_y)
+        self.x = x
+        self.y = y
+
+    def candidate_pairs(self):
+        # Small-small pairs in the fine grid; large-large and small-large in
+        # the coarse one. Reach is at most one cell on either level, so the
+        # neighbouring cells hold every touching pair.
+        fine = self.fine
+        first, second = fine.pairs(fine.keys, fine.index, NEIGHBOUR_OFFSETS, same=True)
+        coarse = self.coarse
+        if coarse is not None:
+            i, j = coarse.pairs(coarse.keys, coarse.index, NEIGHBOUR_OFFSETS, same=True)
+            first += i
+            second += j
+            small_keys = coarse.cells(self.x[fine.index], self.y[fine.index])
+            i, j = coarse.pairs(small_keys, fine.index, ALL_OFFSETS, same=False)
+            first += i
+            second += j
+        if not first:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(first), np.concatenate(second)
+
+
+def resolve_collisions(swarm, grid):
+    # Returns the indices of the balls that touched another ball
+    grid.build(swarm.x, swarm.y, swarm.size)
+    i, j = grid.candidate_pairs()
+    if i.size == 0:
+        return i
+
+    dx = swarm.x[j] - swarm.x[i]
+    dy = swarm.y[j] - swarm.y[i]
+    distance_sq = dx**2 + dy**2
+    reach = swarm.size[i] + swarm.size[j]
+    touching = distance_sq < reach**2
+    if not touching.any():
+        return i[touching]
+
+    i, j = i[touching], j[touching]
+    dx, dy, reach = dx[touching], dy[touching], reach[touching]
+    distance = np.sqrt(distance_sq[touching])
+    # Balls sitting exactly on top of each other get pushed apart along x
+    stacked = distance == 0
+    distance[stacked] = 1.0
+    dx[stacked] = 1.0
+    normal_x = dx / distance
+    normal_y = dy / distance
+    distance[stacked] = 0.0
+
+    # Mass follows the ball's area
+    mass = swarm.size**2
+    total_mass = mass[i] + mass[j]
+    share_i = mass[j] / total_mass
+    share_j = mass[i] / total_mass
+
+    # All pairs are resolved at once from the same velocities, so a ball
+    # touching k others would get k full impulses and speed up without limit
+    # in a crowd. Each pair gets 1/k of its impulse and push, with k the
+    # larger contact count of the two, so both balls still get equal and
+    # opposite changes.
+    contacts = np.bincount(np.concatenate((i, j)), minlength=swarm.size.size)
+    weight = 1.0 / np.maximum(contacts[i], contacts[j])
+    share_i *= weight
+    share_j *= weight
+
+    velocity_x = swarm.speed * np.cos(swarm.angle)
+    velocity_y = swarm.speed * np.sin(swarm.angle)
+    approach = ((velocity_x[i] - velocity_x[j]) * normal_x +
+                (velocity_y[i] - velocity_y[j]) * normal_y)
+    # Only exchange momentum for pairs still moving towards each other
+    impulse = 2 * np.maximum(approach, 0.0)
+    np.add.at(velocity_x, i, -impulse * share_i * normal_x)
+    np.add.at(velocity_y, i, -impulse * share_i * normal_y)
+    np.add.at(velocity_x, j, impulse * share_j * normal_x)
+    np.add.at(velocity_y, j, impulse * share_j * normal_y)
+
+    overlap = reach - distance
+    np.add.at(swarm.x, i, -overlap * share_i * normal_x)
+    np.add.at(swarm.y, i, -overlap * share_i * normal_y)
+    np.add.at(swarm.x, j, overlap * share_j * normal_x)
+    np.add.at(swarm.y, j, overlap * share_j * normal_y)
+
+    moved = np.unique(np.concatenate((i, j)))
+    speed = np.hypot(velocity_x[moved], velocity_y[moved])
+    # Sharing the impulses loses some energy; give it back so a crowd does
+    # not slowly freeze
+    energy_before = np.dot(mass[moved], swarm.speed[moved]**2)
+    energy_after = np.dot(mass[moved], speed**2)
+    if energy_after > 0:
+        speed *= np.sqrt(energy_before / energy_after)
+    swarm.angle[moved] = np.arctan2(velocity_y[moved], velocity_x[moved])
+    swarm.speed[moved] = speed
+    return moved
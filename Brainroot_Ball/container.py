@@ -0,0 +1,153 @@
+# container.py - arbitrary container shapes through a precomputed signed distance field
+import numpy as np
+import pygame
+
+
+class SDFContainer:
+    # The signed distance (negative inside, positive outside) and its gradient
+    # are sampled onto a grid once; query() is then a constant-time bilinear
+    # lookup per point and takes scalars or whole arrays.
+    def __init__(self, distance_fn, bounds, cell=2.0, margin=20.0):
+        left, top, right, bottom = bounds
+        self.x0 = left - margin
+        self.y0 = top - margin
+        self.cell = cell
+        xs = np.arange(self.x0, right + margin + cell, cell)
+        ys = np.arange(self.y0, bottom + margin + cell, cell)
+        gx, gy = np.meshgrid(xs, ys, indexing="ij")
+        self.distance = distance_fn(gx, gy)
+        grad_x, grad_y = np.gradient(self.distance, cell)
+        length = np.hypot(grad_x, grad_y)
+        length[length == 0] = 1.0
+        self.normal_x = grad_x / length
+        self.normal_y = grad_y / length
+
+        # Deepest point inside: where balls start, and the size growth is
+        # capped against the largest circle that fits
+        deepest = np.unravel_index(np.argmin(self.distance), self.distance.shape)
+        self.center = (int(xs[deepest[0]]), int(ys[deepest[1]]))
+        self.radius = float(-self.distance[deepest])
+        self.area = float(np.count_nonzero(self.distance < 0)) * cell * cell
+
+        self.inner_color = pygame.Color("#2f2f2f")
+        self.border_color = pygame.Color("#ffb633")
+        self.image = None
+
+    @classmethod
+    def polygon(cls, points, cell=2.0):
+        points = np.asarray(points, dtype=float)
+        starts = points
+        ends = np.roll(points, -1, axis=0)
+
+        def distance(x, y):
+            nearest = np.full(x.shape, np.inf)
+            inside = np.zeros(x.shape, dtype=bool)
+            for (ax, ay), (bx, by) in zip(starts, ends):
+                ex, ey = bx - ax, by - ay
+                t = np.clip(((x - ax) * ex + (y - ay) * ey) / (ex * ex + ey * ey), 0.0, 1.0)
+                nearest = np.minimum(nearest, np.hypot(x - ax - t * ex, y - ay - t * ey))
+                # Even-odd rule
+                crosses = (ay > y) != (by > y)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    x_cross = ax + (y - ay) * ex / ey
+                inside ^= crosses & (x < x_cross)
+            return np.where(inside, -nearest, nearest)
+
+        bounds = (*points.min(axis=0), *points.max(axis=0))
+        return cls(distance, bounds, cell)
+
+    @classmethod
+    def regular_polygon(cls, center, radius, sides, rotation=0.0, cell=2.0):
+        angles = rotation + np.arange(sides) * 2 * np.pi / sides
+        points = np.column_stack((center[0] + radius * np.cos(angles),
+                                  center[1] + radius * np.sin(angles)))
+        return cls.polygon(points, cell)
+
+    @classmethod
+    def rounded_rect(cls, center, size, corner_radius, cell=2.0):
+        half_w = size[0] / 2 - corner_radius
+        half_h = size[1] / 2 - corner_radius
+
+        def distance(x, y):
+            qx = np.abs(x - center[0]) - half_w
+            qy = np.abs(y - center[1]) - half_h
+            outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+            return outside + np.minimum(np.maximum(qx, qy), 0) - corner_radius
+
+        bounds = (center[0] - size[0] / 2, center[1] - size[1] / 2,
+                  center[0] + size[0] / 2, center[1] + size[1] / 2)
+        return cls(distance, bounds, cell)
+
+    @classmethod
+    def from_mask(cls, mask, cell=2.0, chunk=4096):
+        # mask[x, y] is True inside the shape, e.g. a user-drawn image
+        mask = np.asarray(mask, dtype=bool)
+        padded = np.pad(mask, 1)
+        edge = mask & ~(padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:])
+        edge_x, edge_y = np.nonzero(edge)
+        edge_x = edge_x + 0.5
+        edge_y = edge_y + 0.5
+
+        def distance(x, y):
+            flat_x = x.ravel()
+            flat_y = y.ravel()
+            nearest = np.empty(flat_x.shape)
+            for start in range(0, flat_x.size, chunk):
+                dx = flat_x[start:start + chunk, None] - edge_x[None, :]
+                dy = flat_y[start:start + chunk, None] - edge_y[None, :]
+                nearest[start:start + chunk] = np.sqrt((dx * dx + dy * dy).min(axis=1))
+            ix = np.clip(flat_x.astype(int), 0, mask.shape[0] - 1)
+            iy = np.clip(flat_y.astype(int), 0, mask.shape[1] - 1)
+            # Everything off the image is outside; pixels on the image border
+            # are edge pixels (the padding above), so the border is a wall
+            inside = (mask[ix, iy] & (flat_x >= 0) & (flat_y >= 0)
+                      & (flat_x < mask.shape[0]) & (flat_y < mask.shape[1]))
+            return np.where(inside, -nearest, nearest).reshape(x.shape)
+
+        xs, ys = np.nonzero(mask)
+        bounds = (xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)
+        return cls(distance, bounds, cell)
+
+    @classmethod
+    def from_image(cls, path, cell=2.0):
+        # Any pixel brighter than mid-grey counts as inside
+        pixels = pygame.surfarray.array3d(pygame.image.load(path))
+        return cls.from_mask(pixels.mean(axis=2) > 127, cell)
+
+    def query(self, x, y):
+        gx = (np.asarray(x, dtype=float) - self.x0) / self.cell
+        gy = (np.asarray(y, dtype=float) - self.y0) / self.cell
+        nx, ny = self.distance.shape
+        gx = np.clip(gx, 0, nx - 1.001)
+        gy = np.clip(gy, 0, ny - 1.001)
+        ix = gx.astype(int)
+        iy = gy.astype(int)
+        fx = gx - ix
+        fy = gy - iy
+
+        def sample(grid):
+            return ((grid[ix, iy] * (1 - fx) + grid[ix + 1, iy] * fx) * (1 - fy) +
+                    (grid[ix, iy + 1] * (1 - fx) + grid[ix + 1, iy + 1] * fx) * fy)
+
+        normal_x = sample(self.normal_x)
+        normal_y = sample(self.normal_y)
+        length = np.hypot(normal_x, normal_y)
+        length = np.where(length == 0, 1.0, length)
+        return sample(self.distance), normal_x / length, normal_y / length
+
+    def _render(self, size):
+        px, py = np.meshgrid(np.arange(size[0]) + 0.5, np.arange(size[1]) + 0.5, indexing="ij")
+        distance, _, _ = self.query(px, py)
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        rgba = np.zeros((size[0], size[1], 4), dtype=np.uint8)
+        rgba[distance < 0] = tuple(self.inner_color)
+        rgba[(distance > -3) & (distance < 0.5)] = tuple(self.border_color)
+        pygame.surfarray.pixels3d(image)[...] = rgba[..., :3]
+        pygame.surfarray.pixels_alpha(image)[...] = rgba[..., 3]
+        return image
+
+    def draw(self, screen, border=True):
+        # The border is part of the cached image, so it costs nothing extra
+        if self.image is None or self.image.get_size() != screen.get_size():
+            self.image = self._render(screen.get_size())
+        return screen.blit(self.image, (0, 0))
@@ -0,0 +1,156 @@
+# core.py - ball kinematics without pygame
+import bisect
+import math
+import random
+import struct
+from kinematics import Kinematics, jitter_table
+
+LOG_MAGIC = b"BRBL"
+LOG_VERSION = 1
+# magic, version, center x, center y, circle radius, speed
+LOG_HEADER = struct.Struct("<4sHdddd")
+# time [frames], x, y, angle, size, r, g, b
+LOG_RECORD = struct.Struct("<dffffBBB")
+
+
+class Simulation(Kinematics):
+    __slots__ = ("rng", "center", "radius", "size", "color", "growth", "max_size",
+                 "angle_variation", "jitter", "frame", "bounces", "container", "log")
+
+    def __init__(self, center, radius, seed=None, rng=None, size=10, speed=10, growth=2,
+                 max_ratio=0.3, angle_variation=math.pi / 4, log=None, container=None):
+        # container: optional object with query(x, y) -> (signed distance,
+        # normal x, normal y) for walls other than the circle
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.center = center
+        self.radius = radius
+        self.size = size
+        self.color = self.random_color()
+        super().__init__(center[0], center[1], speed, self.rng.uniform(0, 2 * math.pi))
+        self.growth = growth
+        self.max_size = radius * max_ratio
+        self.angle_variation = angle_variation
+        self.jitter = jitter_table(angle_variation)
+        self.frame = 0
+        self.bounces = 0
+        self.container = container
+        self.log = log
+        if log is not None:
+            log.write_header(self)
+            self._record(0)
+
+    def random_color(self):
+        return (self.rng.randint(50, 255),
+                self.rng.randint(50, 255),
+                self.rng.randint(50, 255))
+
+    def _record(self, time):
+        if self.log is not None:
+            self.log.write(time, self.x, self.y, self.angle, self.size, self.color)
+
+    def step(self):
+        self.frame += 1
+        new_x = self.x + self.vx
+        new_y = self.y + self.vy
+
+        if self.container is None:
+            # Circle: exact analytic test
+            max_allowed_distance = self.radius - self.size
+            offset_x = new_x - self.center[0]
+            offset_y = new_y - self.center[1]
+            distance_squared = offset_x * offset_x + offset_y * offset_y
+
+            if distance_squared < max_allowed_distance * max_allowed_distance:
+                self.x = new_x
+                self.y = new_y
+                return False
+
+            distance_from_center = math.sqrt(distance_squared)
+            normal_x = offset_x / distance_from_center
+            normal_y = offset_y / distance_from_center
+            wall_x = self.center[0] + max_allowed_distance * normal_x
+            wall_y = self.center[1] + max_allowed_distance * normal_y
+        else:
+            distance, normal_x, normal_y = self.container.query(new_x, new_y)
+            penetration = float(distance) + self.size
+
+            if penetration < 0:
+                self.x = new_x
+                self.y = new_y
+                return False
+
+            normal_x = float(normal_x)
+            normal_y = float(normal_y)
+            wall_x = new_x - penetration * normal_x
+            wall_y = new_y - penetration * normal_y
+
+        cos_a, sin_a = self.jitter.pick(self.rng)
+        self.reflect(normal_x, normal_y)
+        self.rotate(cos_a, sin_a)
+        self.color = self.random_color()
+
+        if self.size < self.max_size:
+            self.size += self.growth
+
+        self.x = wall_x
+        self.y = wall_y
+        self.bounces += 1
+        self._record(self.frame)
+        return True
+
+    def is_full(self):
+        return self.size >= self.max_size
+
+    def run(self, max_frames=None):
+        while not self.is_full():
+            if max_frames is not None and self.frame >= max_frames:
+                break
+            self.step()
+        return self.frame
+
+
+class EventLogWriter:
+    def __init__(self, path):
+        self.file = open(path, "wb")
+
+    def write_header(self, sim):
+        self.file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, sim.center[0], sim.center[1],
+                                        sim.radius, sim.speed))
+
+    def write(self, time, x, y, angle, size, color):
+        self.file.write(LOG_RECORD.pack(time, x, y, angle, size, color[0], color[1], color[2]))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventLog:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, cx, cy, radius, speed = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path} is not a Brainroot_Ball event log")
+        self.center = (cx, cy)
+        self.radius = radius
+        self.speed = speed
+        self.events = list(LOG_RECORD.iter_unpack(data[LOG_HEADER.size:]))
+        self.times = [event[0] for event in self.events]
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    def state_at(self, time):
+        # Between two bounces the ball moves in a straight line
+        index = max(bisect.bisect_right(self.times, time) - 1, 0)
+        event_time, x, y, angle, size, r, g, b = self.events[index]
+        travelled = self.speed * (time - event_time)
+        return (x + travelled * math.cos(angle), y + travelled * math.sin(angle),
+                size, (r, g, b))
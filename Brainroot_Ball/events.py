@@ -0,0 +1,83 @@
+# events.py
+import math
+from ball import Ball
+
+
+class EventBall(Ball):
+    # Time is measured in frames: the ball still covers `speed` pixels per
+    # frame, but bounces happen at the exact moment it touches the wall
+    __slots__ = ("time", "segment_time", "segment_x", "segment_y", "next_hit")
+
+    def __init__(self, circle, rng=None, log=None):
+        super().__init__(circle, rng=rng, log=log)
+        self.time = 0.0
+        self._start_segment(0.0)
+
+    def _start_segment(self, time):
+        self.segment_time = time
+        self.segment_x = self.x
+        self.segment_y = self.y
+        self.next_hit = time + self._time_to_wall()
+
+    def _time_to_wall(self):
+        # Solve |p + t*v - c| = R - size for the positive root
+        max_allowed_distance = self.radius - self.size
+        speed = self.speed
+        qx = self.segment_x - self.center[0]
+        qy = self.segment_y - self.center[1]
+        b = (qx * self.vx + qy * self.vy) / speed
+        c = qx * qx + qy * qy - max_allowed_distance * max_allowed_distance
+        discriminant = max(b * b - c, 0.0)
+        distance = -b + math.sqrt(discriminant)
+        return max(distance, 0.0) / speed
+
+    def position_at(self, time):
+        elapsed = time - self.segment_time
+        return (self.segment_x + elapsed * self.vx,
+                self.segment_y + elapsed * self.vy)
+
+    def _bounce(self):
+        hit_x, hit_y = self.position_at(self.next_hit)
+        normal_x = hit_x - self.center[0]
+        normal_y = hit_y - self.center[1]
+        normal_length = math.sqrt(normal_x**2 + normal_y**2)
+        normal_x /= normal_length
+        normal_y /= normal_length
+
+        cos_a, sin_a = self.jitter.pick(self.rng)
+        self.reflect(normal_x, normal_y)
+        self.rotate(cos_a, sin_a)
+        self.color = self.random_color()
+        if self.size < self.max_size:
+            self.size += self.growth
+
+        # Keep touching the wall after growing
+        max_allowed_distance = self.radius - self.size
+        self.x = self.center[0] + max_allowed_distance * normal_x
+        self.y = self.center[1] + max_allowed_distance * normal_y
+        self.bounces += 1
+        self._record(self.next_hit)
+        self._start_segment(self.next_hit)
+
+    def advance_to(self, time):
+        while self.next_hit <= time:
+            self._bounce()
+        self.time = time
+        self.x, self.y = self.position_at(time)
+
+    def update(self, frames=1.0):
+        self.advance_to(self.time + frames)
+        if self.trail is not None:
+            self.trail.push(self.x, self.y)
+
+    def run_until_full(self, max_bounces=None, max_time=None):
+        # Jump from bounce to bounce without touching the frames in between
+        while not self.is_full():
+            if max_bounces is not None and self.bounces >= max_bounces:
+                break
+            if max_time is not None and self.next_hit > max_time:
+                self.advance_to(max_time)
+                return self.time
+            self._bounce()
+        self.time = self.segment_time
+        return self.time
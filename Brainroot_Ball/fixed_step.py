@@ -0,0 +1,72 @@
+# fixed_step.py
+import threading
+import time
+
+
+class FixedStepSimulation:
+    # Runs ball.update() at a fixed rate on its own thread. The render loop
+    # draws the state interpolated between the last two published snapshots,
+    # so physics and render rates are independent.
+    def __init__(self, ball, physics_hz=240, base_hz=60, max_catch_up=0.25, trail=None):
+        self.ball = ball
+        self.physics_hz = physics_hz
+        self.dt = 1.0 / physics_hz
+        self.max_catch_up = max_catch_up
+        # Ball.update moves `speed` pixels per step and was tuned for 60 steps/s
+        ball.speed = ball.speed * base_hz / physics_hz
+        self.steps = 0
+        # Fed with the interpolated positions on the render thread, which is
+        # the only thread that touches it; the ball itself gets no trail
+        self.trail = trail
+        self.lock = threading.Lock()
+        self.previous = self.current = (0.0, ball.snapshot())
+        self.running = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.running = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+    def _run(self):
+        next_step = self.start_time
+        while self.running:
+            self.ball.update()
+            self.steps += 1
+            snapshot = (self.steps * self.dt, self.ball.snapshot())
+            with self.lock:
+                self.previous, self.current = self.current, snapshot
+
+            next_step += self.dt
+            now = time.perf_counter()
+            if now < next_step:
+                time.sleep(next_step - now)
+            elif now - next_step > self.max_catch_up:
+                # Too far behind (e.g. the machine stalled): drop the backlog
+                # instead of running hundreds of steps back to back
+                self.start_time += now - next_step
+                next_step = now
+
+    def interpolated(self):
+        with self.lock:
+            (t0, state0), (t1, state1) = self.previous, self.current
+        # Render one step in the past so there is always a pair to blend
+        render_time = time.perf_counter() - self.start_time - self.dt
+        alpha = (render_time - t0) / (t1 - t0) if t1 > t0 else 1.0
+        alpha = min(max(alpha, 0.0), 1.0)
+        x0, y0, _, _ = state0
+        x1, y1, size, color = state1
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha, size, color
+
+    def is_full(self):
+        return self.ball.is_full()
+
+    def draw(self, screen):
+        x, y, size, color = self.interpolated()
+        if self.trail is not None:
+            self.trail.push(x, y)
+        return self.ball.draw_state(screen, x, y, size, color, self.trail)
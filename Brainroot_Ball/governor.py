@@ -0,0 +1,90 @@
+# governor.py - adaptive quality for a fixed frame budget
+from collections import deque, namedtuple
+
+QualityLevel = namedtuple("QualityLevel", "name antialias border trail_scale render_every")
+
+# Best first; each level gives up a little more than the one before
+QUALITY_LEVELS = (
+    QualityLevel("full", antialias=True, border=True, trail_scale=1.0, render_every=1),
+    QualityLevel("no-antialias", antialias=False, border=True, trail_scale=1.0, render_every=1),
+    QualityLevel("no-border", antialias=False, border=False, trail_scale=1.0, render_every=1),
+    QualityLevel("half-res-trails", antialias=False, border=False, trail_scale=0.5, render_every=1),
+    QualityLevel("half-rate", antialias=False, border=False, trail_scale=0.5, render_every=2),
+    QualityLevel("third-rate", antialias=False, border=False, trail_scale=0.5, render_every=3),
+)
+
+Decision = namedtuple("Decision", "frame old new average_ms reason")
+
+
+def active_levels(levels=QUALITY_LEVELS, antialias=True, border=True, trails=True):
+    # Only the levels that change something in this setup, e.g. without
+    # anti-aliased sprites "no-antialias" looks exactly like "full". Each
+    # remaining step down then actually saves work.
+    kept = []
+    previous = None
+    for level in levels:
+        effect = (level.antialias if antialias else None, level.border if border else None,
+                  level.trail_scale if trails else None, level.render_every)
+        if effect != previous:
+            kept.append(level)
+            previous = effect
+    return tuple(kept)
+
+
+class FrameGovernor:
+    # Feed it the cost of every frame (the work, not the time spent waiting
+    # in clock.tick). When the smoothed cost stays over budget it steps down a
+    # level; when it stays well under budget it steps back up.
+    def __init__(self, budget_ms=1000 / 60, levels=QUALITY_LEVELS, smoothing=0.1,
+                 downgrade_after=15, upgrade_after=120, headroom=0.6, warmup=30, history=100):
+        self.budget = budget_ms / 1000
+        self.levels = levels
+        self.smoothing = smoothing
+        self.downgrade_after = downgrade_after
+        self.upgrade_after = upgrade_after
+        self.headroom = headroom
+        self.warmup = warmup
+        self.index = 0
+        self.average = None
+        self.over = 0
+        self.under = 0
+        self.frames = 0
+        self.decisions = deque(maxlen=history)
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def frame(self, cost):
+        self.frames += 1
+        # The first frames pay one-off costs (rendering an SDF container's
+        # image, filling the sprite cache) that say nothing about later ones
+        if self.frames <= self.warmup:
+            return None
+        if self.average is None:
+            self.average = cost
+        else:
+            self.average += self.smoothing * (cost - self.average)
+
+        if self.average > self.budget:
+            self.over += 1
+            self.under = 0
+        elif self.average < self.budget * self.headroom:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= self.downgrade_after and self.index < len(self.levels) - 1:
+            return self._change(self.index + 1, "over budget")
+        if self.under >= self.upgrade_after and self.index > 0:
+            return self._change(self.index - 1, "headroom")
+        return None
+
+    def _change(self, index, reason):
+        decision = Decision(self.frames, self.level.name, self.levels[index].name,
+                            self.average * 1000, reason)
+        self.decisions.append(decision)
+        self.index = index
+        self.over = self.under = 0
+        return decision
@@ -0,0 +1,70 @@
+# kinematics.py - position and velocity vector without angles
+import functools
+import math
+
+
+class Kinematics:
+    # The direction is kept as a velocity vector, so moving is two additions
+    # and a bounce is a reflection plus a rotation: no cos/sin/atan2 per frame.
+    # angle and speed are still available, computed on demand.
+    __slots__ = ("x", "y", "vx", "vy")
+
+    def __init__(self, x, y, speed, angle):
+        self.x = x
+        self.y = y
+        self.vx = speed * math.cos(angle)
+        self.vy = speed * math.sin(angle)
+
+    @property
+    def angle(self):
+        return math.atan2(self.vy, self.vx)
+
+    @angle.setter
+    def angle(self, angle):
+        speed = self.speed
+        self.vx = speed * math.cos(angle)
+        self.vy = speed * math.sin(angle)
+
+    @property
+    def speed(self):
+        return math.sqrt(self.vx * self.vx + self.vy * self.vy)
+
+    @speed.setter
+    def speed(self, speed):
+        angle = self.angle
+        self.vx = speed * math.cos(angle)
+        self.vy = speed * math.sin(angle)
+
+    def reflect(self, normal_x, normal_y):
+        # normal must be unit length
+        dot = self.vx * normal_x + self.vy * normal_y
+        self.vx -= 2 * dot * normal_x
+        self.vy -= 2 * dot * normal_y
+
+    def rotate(self, cos_a, sin_a):
+        vx = self.vx
+        self.vx = vx * cos_a - self.vy * sin_a
+        self.vy = vx * sin_a + self.vy * cos_a
+
+
+class JitterTable:
+    # Random turn in [-variation, variation] as a precomputed rotation.
+    # pick() draws one rng.random(), like rng.uniform() does, and quantizes
+    # the angle to `steps` values.
+    __slots__ = ("steps", "cos", "sin")
+
+    def __init__(self, variation, steps=1024):
+        self.steps = steps
+        angles = [-variation + (i + 0.5) * 2 * variation / steps for i in range(steps)]
+        self.cos = [math.cos(angle) for angle in angles]
+        self.sin = [math.sin(angle) for angle in angles]
+
+    def pick(self, rng):
+        i = int(rng.random() * self.steps)
+        return self.cos[i], self.sin[i]
+
+
+@functools.lru_cache(maxsize=None)
+def jitter_table(variation, steps=1024):
+    # Tables are read-only, so every ball with the same variation shares one
+    return JitterTable(variation, steps)
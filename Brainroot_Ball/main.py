@@ -1,41 +1,271 @@
+import argparse
+import os
+import random
+import time
+import numpy as np
 import pygame
 import sys
 from circle import Circle
 from ball import Ball
+from swarm import BallSwarm
+from events import EventBall
+from renderer import DirtyRectRenderer
+from sprites import SpriteCache
+from core import EventLogWriter
+from profiler import FrameProfiler, NullProfiler
+from recorder import FrameRecorder
+from fixed_step import FixedStepSimulation
+from raster import BatchRenderer
+from container import SDFContainer
+from governor import FrameGovernor, active_levels
+from trails import Trails
+
+def make_container(args, center, radius):
+    if args.container_image:
+        return SDFContainer.from_image(args.container_image)
+    if args.container == "hexagon":
+        return SDFContainer.regular_polygon(center, radius, 6)
+    if args.container == "star":
+        angles = np.arange(10) * np.pi / 5 - np.pi / 2
+        radii = np.where(np.arange(10) % 2 == 0, radius, radius * 0.55)
+        return SDFContainer.polygon(np.column_stack((center[0] + radii * np.cos(angles),
+                                                     center[1] + radii * np.sin(angles))))
+    if args.container == "rounded":
+        return SDFContainer.rounded_rect(center, (2 * radius, 1.5 * radius), radius * 0.25)
+    return Circle(center, radius)
+
+def run_headless(ball, max_frames=None):
+    if isinstance(ball, EventBall):
+        frames = ball.run_until_full(max_time=max_frames)
+        print(f"{'full' if ball.is_full() else 'not full'} after {frames:.2f} frames, {ball.bounces} bounces")
+    elif isinstance(ball, BallSwarm):
+        frames = 0
+        while not ball.is_full():
+            if max_frames is not None and frames >= max_frames:
+                break
+            ball.update()
+            frames += 1
+        grown = int((ball.size >= ball.max_size).sum())
+        print(f"{'full' if ball.is_full() else 'not full'} after {frames} frames, "
+              f"{grown} of {ball.count} balls at the stop size")
+    else:
+        frames = ball.run(max_frames)
+        print(f"{'full' if ball.is_full() else 'not full'} after {frames} frames, {ball.bounces} bounces")
 
 def main():
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Kulka w kole")
+    parser.add_argument("--balls", type=int, default=1, help="number of balls (more than 1 uses BallSwarm)")
+    parser.add_argument("--collide", action="store_true", help="let the balls bounce off each other")
+    parser.add_argument("--events", action="store_true", help="event-driven ball with exact wall hits")
+    parser.add_argument("--dirty-rects", action="store_true", help="cache the background and redraw only what the balls touched")
+    parser.add_argument("--sprites", action="store_true", help="blit pre-rendered ball sprites instead of drawing circles")
+    parser.add_argument("--antialias", action="store_true", help="anti-aliased sprites (implies --sprites)")
+    parser.add_argument("--sprite-cache", type=int, default=512, help="maximum number of cached sprites")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible run")
+    parser.add_argument("--log", help="write every bounce to this binary event log (single ball only)")
+    parser.add_argument("--headless", action="store_true", help="simulate without a window until the ball is full grown")
+    parser.add_argument("--max-frames", type=int, help="with --headless, stop after this many frames even if not full")
+    parser.add_argument("--profile", action="store_true", help="time each frame phase, F3 toggles the HUD")
+    parser.add_argument("--profile-dump", help="write per-frame phase timings [ms] to this CSV file")
+    parser.add_argument("--record", help="render offscreen as fast as possible into out.mp4 (ffmpeg), frames.raw or a directory of PNGs")
+    parser.add_argument("--record-frames", type=int, help="stop recording after this many frames (required for .raw)")
+    parser.add_argument("--fps", type=int, default=60, help="render rate")
+    parser.add_argument("--physics-hz", type=int, default=0,
+                        help="run the physics on its own thread at this fixed rate and interpolate when drawing")
+    parser.add_argument("--batch", action="store_true", help="rasterize all balls in one NumPy pass and blit the frame once")
+    parser.add_argument("--container", choices=["circle", "hexagon", "star", "rounded"], default="circle",
+                        help="shape the balls bounce in")
+    parser.add_argument("--container-image", help="use the bright pixels of this image as the container")
+    parser.add_argument("--trail", type=int, default=0, metavar="N",
+                        help="draw a fading trail of each ball's last N positions")
+    parser.add_argument("--governor", action="store_true",
+                        help="lower the drawing quality step by step when frames go over budget")
+    parser.add_argument("--frame-budget", type=float, help="frame budget for --governor [ms] (default: 1000 / fps)")
+    parser.add_argument("--downgrade-after", type=int, default=15, metavar="FRAMES",
+                        help="--governor drops a level after this many frames over budget")
+    parser.add_argument("--upgrade-after", type=int, default=120, metavar="FRAMES",
+                        help="--governor raises a level after this many frames under --headroom")
+    parser.add_argument("--headroom", type=float, default=0.6,
+                        help="fraction of the budget a frame must stay under for --governor to raise a level")
+    parser.add_argument("--warmup", type=int, default=30, metavar="FRAMES",
+                        help="frames --governor ignores at the start, while caches fill")
+    parser.add_argument("--smoothing", type=float, default=0.1,
+                        help="weight of the newest frame in --governor's moving average of frame costs")
+    args = parser.parse_args()
+    if args.events and (args.container != "circle" or args.container_image):
+        parser.error("--events needs the circle container")
+    if args.batch and (args.dirty_rects or args.sprites or args.antialias):
+        parser.error("--batch draws the whole frame itself")
+    if args.log and args.balls > 1:
+        parser.error("--log records a single ball")
+    if args.physics_hz and (args.events or args.headless):
+        parser.error("--physics-hz needs a stepped ball in a window")
+    if args.physics_hz and args.log:
+        # The log's speed and frame times would be in physics steps, which
+        # replay.py plays back as 60 Hz frames
+        parser.error("--log can't be combined with --physics-hz")
+    if args.record and args.record.endswith(".raw") and not args.record_frames:
+        parser.error("recording to a .raw file needs --record-frames")
+    if args.record_frames is not None and args.record_frames < 1:
+        parser.error("--record-frames must be at least 1")
+    if args.record and args.record.endswith(".raw") and not args.record_frames:
+        parser.error("recording to a .raw file needs --record-frames")
+    if args.record_frames is not None and args.record_frames < 1:
+        parser.error("--record-frames must be at least 1")
+    if args.max_frames is not None and args.max_frames < 1:
+        parser.error("--max-frames must be at least 1")
+    if args.downgrade_after < 1 or args.upgrade_after < 1:
+        parser.error("--downgrade-after and --upgrade-after must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    if not 0 < args.headroom < 1 or not 0 < args.smoothing <= 1:
+        parser.error("--headroom must be in (0, 1) and --smoothing in (0, 1]")
+
     screen_width, screen_height = 800, 800
+    circle_radius = 300
+    circle_center = (screen_width // 2, screen_height // 2)
+
+    circle = make_container(args, circle_center, circle_radius)
+    log = EventLogWriter(args.log) if args.log else None
+    if args.balls > 1:
+        ball = BallSwarm(circle, args.balls, rng=np.random.default_rng(args.seed), collide=args.collide)
+    elif args.events:
+        ball = EventBall(circle, rng=random.Random(args.seed), log=log)
+    else:
+        ball = Ball(circle, rng=random.Random(args.seed), log=log)
+
+    if args.headless:
+        run_headless(ball, args.max_frames)
+        if log:
+            log.close()
+        return
+
+    if args.record:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Kulka w kole")
     clock = pygame.time.Clock()
 
-    circle_radius = 300
-    circle_center = (screen_width // 2, screen_height // 2)
-    
-    circle = Circle(circle_center, circle_radius)
-    ball = Ball(circle)
+    if args.sprites or args.antialias:
+        ball.sprites = SpriteCache(args.sprite_cache, antialias=args.antialias)
+    trail = Trails(max(args.balls, 1), args.trail, background=circle.inner_color) if args.trail else None
+
+    def draw_background(surface, border=True):
+        surface.fill((39, 39, 39))
+        circle.draw(surface, border)
+
+    renderer = DirtyRectRenderer(screen, draw_background) if args.dirty_rects else None
+    raster = BatchRenderer(screen, draw_background) if args.batch else None
+    if args.profile or args.profile_dump:
+        profiler = FrameProfiler(dump_path=args.profile_dump, show_hud=args.profile)
+    else:
+        profiler = NullProfiler()
+    recorder = None
+    if args.record:
+        recorder = FrameRecorder(args.record, (screen_width, screen_height), max_frames=args.record_frames)
+        record_start = time.perf_counter()
+    # What gets drawn: the ball itself, or its interpolated state when the
+    # physics runs on a separate thread
+    scene = ball
+    if args.physics_hz:
+        scene = FixedStepSimulation(ball, args.physics_hz, trail=trail)
+        scene.start()
+    else:
+        ball.trail = trail
+    governor = None
+    if args.governor:
+        # Anti-aliasing only exists with --antialias, the border is cached
+        # with --dirty-rects and --batch (and in any non-circle container), and
+        # --batch draws no trails
+        levels = active_levels(antialias=args.antialias and not args.batch,
+                               border=isinstance(circle, Circle) and not (args.dirty_rects or args.batch),
+                               trails=args.trail > 0 and not args.batch)
+        governor = FrameGovernor(args.frame_budget or 1000 / args.fps, levels, smoothing=args.smoothing,
+                                 downgrade_after=args.downgrade_after, upgrade_after=args.upgrade_after,
+                                 headroom=args.headroom, warmup=args.warmup)
+    quality = None
+    frame = 0
 
     running = True
     while running:
+        frame_start = time.perf_counter()
+        profiler.start_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE and renderer:
+                renderer.invalidate()
+            profiler.handle_event(event)
+        profiler.mark()
+
+        if scene is ball:
+            ball.update()
+        profiler.mark()
 
-        screen.fill((39, 39, 39)) 
-        
-        circle.draw(screen)
-        ball.update()
-        ball.draw(screen)
+        if governor and governor.level is not quality:
+            quality = governor.level
+            if ball.sprites is not None:
+                ball.sprites.antialias = args.antialias and quality.antialias
+            if trail is not None:
+                trail.scale = quality.trail_scale
+            pygame.display.set_caption(f"Kulka w kole - {quality.name}")
+        frame += 1
 
-        pygame.display.flip()
-        clock.tick(60)
+        if quality and frame % quality.render_every:
+            # Physics keeps running, this frame is just not drawn
+            profiler.mark()
+        elif raster:
+            if scene is ball:
+                raster.draw(ball.x, ball.y, ball.size, ball.color)
+            else:
+                raster.draw(*scene.interpolated())
+            profiler.draw(screen)
+            profiler.mark()
+            pygame.display.flip()
+        elif renderer:
+            renderer.draw(scene, profiler)
+            profiler.mark()
+            renderer.flip()
+        else:
+            draw_background(screen, quality is None or quality.border)
+            scene.draw(screen)
+            profiler.draw(screen)
+            profiler.mark()
+            pygame.display.flip()
+        profiler.mark()
+        if governor:
+            decision = governor.frame(time.perf_counter() - frame_start)
+            if decision:
+                print(f"frame {decision.frame}: {decision.old} -> {decision.new} "
+                      f"({decision.reason}, {decision.average_ms:.2f} ms average)")
+
+        if recorder:
+            # No frame cap while recording: render as fast as possible
+            recorder.capture(screen)
+            if args.record_frames and recorder.count >= args.record_frames:
+                running = False
+        else:
+            clock.tick(args.fps)
+        profiler.mark()
+        profiler.end_frame()
 
-        if ball.size >= circle_radius * 0.3:
+        if ball.is_full():
             running = False
 
+    if scene is not ball:
+        scene.stop()
+    if ball.sprites is not None:
+        print(ball.sprites.stats())
+    if log:
+        log.close()
+    profiler.close()
+    if recorder:
+        recorder.close()
+        elapsed = time.perf_counter() - record_start
+        print(f"recorded {recorder.count} frames in {elapsed:.2f} s ({recorder.count / elapsed:.0f} fps)")
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,23 +2,36 @@ import pygame
 import random
 import math
 import time
+from renderer import DirtyRectRenderer
+from profiler import FrameProfiler, NullProfiler
+from trails import Trails
+from kinematics import Kinematics, jitter_table
+
+class Ball(Kinematics):
+    __slots__ = ("center", "radius_circle", "radius", "growth", "max_radius", "color", "max_speed",
+                 "start_distance_from_edge", "circle_border_thickness", "growth_delay",
+                 "bounced_this_frame", "trail")
+
+    # Losowy obrót po odbiciu, ±0.1 rad
+    JITTER = jitter_table(0.1)
 
-class Ball:
     def __init__(self, center, radius_circle, initial_radius, speed, growth, max_radius, color, max_speed, circle_border_thickness):
         self.center = center
         self.radius_circle = radius_circle
         self.radius = initial_radius
-        self.speed = speed
         self.growth = growth
         self.max_radius = max_radius
         self.color = color
         self.max_speed = max_speed
-        self.angle = random.uniform(0, 2 * math.pi)
+        angle = random.uniform(0, 2 * math.pi)
         self.start_distance_from_edge = 30
         self.circle_border_thickness = circle_border_thickness
+        # Prędkość nie zmienia się, więc limit max_speed wystarczy sprawdzić raz
+        super().__init__(0.0, 0.0, min(speed, max_speed), angle)
         self.x, self.y = self._random_start_position()
         self.growth_delay = 0
         self.bounced_this_frame = False 
+        self.trail = None
 
     def _random_start_position(self):
         angle = random.uniform(0, 2 * math.pi)
@@ -34,17 +47,8 @@ class Ball:
                 return color
 
     def calculate_new_position(self):
-        velocity_x = math.cos(self.angle) * self.speed
-        velocity_y = math.sin(self.angle) * self.speed
-
-        current_speed = math.sqrt(velocity_x**2 + velocity_y**2)
-        if current_speed > self.max_speed:
-            scale = self.max_speed / current_speed
-            velocity_x *= scale
-            velocity_y *= scale
-        
-        self.x += velocity_x
-        self.y += velocity_y
+        self.x += self.vx
+        self.y += self.vy
         self.bounced_this_frame = False 
 
     def distance_to_center(self):
@@ -61,22 +65,15 @@ class Ball:
             normal_x = (self.x - self.center[0]) / dist_to_center
             normal_y = (self.y - self.center[1]) / dist_to_center
 
-            # Oblicz wektor prędkości
-            velocity_x = math.cos(self.angle) * self.speed
-            velocity_y = math.sin(self.angle) * self.speed
-
-            dot_product = velocity_x * normal_x + velocity_y * normal_y
-            velocity_x -= 2 * dot_product * normal_x
-            velocity_y -= 2 * dot_product * normal_y
-
-            self.angle = math.atan2(velocity_y, velocity_x)
-            
-            self.angle += random.uniform(-0.1, 0.1)
+            # Odbicie wektora prędkości względem normalnej
+            self.reflect(normal_x, normal_y)
+            self.rotate(*self.JITTER.pick(random))
 
             self.growth_delay = 10
 
-            self.x += math.cos(self.angle) * self.radius * 0.1
-            self.y += math.sin(self.angle) * self.radius * 0.1
+            step = self.radius * 0.1 / self.speed
+            self.x += self.vx * step
+            self.y += self.vy * step
     
     def update(self):
         if self.growth_delay > 0:
@@ -85,10 +82,16 @@ class Ball:
             if self.radius + self.growth <= self.max_radius:
                self.radius += self.growth
                self.color = self.random_color((255, 255, 255))
+        if self.trail is not None:
+            self.trail.push(self.x, self.y)
 
 
     def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        if self.trail is not None:
+            rects = self.trail.draw(screen, (self.color,))
+            rects.append(pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius))
+            return rects
+        return pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
 
 class Game:
     def __init__(self):
@@ -102,6 +105,10 @@ class Game:
         self.MAX_BALL_SPEED = 10
         self.FPS = 60
         self.CIRCLE_BORDER_THICKNESS = 5
+        self.DIRTY_RECTS = False  # odświeżaj tylko obszary, po których przeszła kulka
+        self.PROFILE = False  # pomiar czasu faz klatki, F3 pokazuje/ukrywa HUD
+        self.PROFILE_DUMP = None  # plik CSV z czasami każdej klatki
+        self.TRAIL_LENGTH = 0  # długość śladu za kulką (0 = bez śladu)
 
         # Kolory
         self.OUTSIDE_COLOR = (39, 39, 39)  # #272727
@@ -117,31 +124,56 @@ class Game:
 
         # Utwórz kulkę
         self.ball = Ball(self.CENTER, self.RADIUS_CIRCLE, self.BALL_INITIAL_RADIUS, self.BALL_SPEED, self.BALL_GROWTH, self.MAX_BALL_RADIUS, (255,255,255), self.MAX_BALL_SPEED, self.CIRCLE_BORDER_THICKNESS)
+        if self.TRAIL_LENGTH:
+            self.ball.trail = Trails(length=self.TRAIL_LENGTH, background=self.INSIDE_COLOR)
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.renderer = DirtyRectRenderer(self.screen, self.draw_background) if self.DIRTY_RECTS else None
+        if self.PROFILE or self.PROFILE_DUMP:
+            self.profiler = FrameProfiler(dump_path=self.PROFILE_DUMP, show_hud=self.PROFILE)
+        else:
+            self.profiler = NullProfiler()
+
+    def draw_background(self, surface):
+        surface.fill(self.OUTSIDE_COLOR)
+        pygame.draw.circle(surface, self.INSIDE_COLOR, self.CENTER, self.RADIUS_CIRCLE)
+        pygame.draw.circle(surface, self.CIRCLE_BORDER_COLOR, self.CENTER, self.RADIUS_CIRCLE, self.CIRCLE_BORDER_THICKNESS)
 
     def run(self):
+        profiler = self.profiler
         while self.running:
+            profiler.start_frame()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
-
-            self.screen.fill(self.OUTSIDE_COLOR)
-
-            pygame.draw.circle(self.screen, self.INSIDE_COLOR, self.CENTER, self.RADIUS_CIRCLE)
-            pygame.draw.circle(self.screen, self.CIRCLE_BORDER_COLOR, self.CENTER, self.RADIUS_CIRCLE, self.CIRCLE_BORDER_THICKNESS)
+                elif event.type == pygame.VIDEOEXPOSE and self.renderer:
+                    self.renderer.invalidate()
+                profiler.handle_event(event)
+            profiler.mark()
 
             self.ball.calculate_new_position()
             self.ball.bounce()
             self.ball.update()
-
-            self.ball.draw(self.screen)
-
-            pygame.display.flip()
+            profiler.mark()
+
+            if self.renderer:
+                self.renderer.draw(self.ball, profiler)
+                profiler.mark()
+                self.renderer.flip()
+            else:
+                self.draw_background(self.screen)
+                self.ball.draw(self.screen)
+                profiler.draw(self.screen)
+                profiler.mark()
+                pygame.display.flip()
+            profiler.mark()
 
             self.clock.tick(self.FPS)
+            profiler.mark()
+            profiler.end_frame()
 
+        profiler.close()
         pygame.quit()
 
 if __name__ == "__main__":
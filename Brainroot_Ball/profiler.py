@@ -0,0 +1,115 @@
+# profiler.py
+import time
+import numpy as np
+import pygame
+
+PHASES = ("events", "update", "draw", "flip", "tick")
+
+
+class FrameProfiler:
+    # Call mark() once at the end of each phase, in PHASES order
+    def __init__(self, capacity=600, dump_path=None, show_hud=False, hud_interval=30):
+        self.times = np.zeros((capacity, len(PHASES)))
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+        self.frame = 0
+        self.phase = 0
+        self.last = time.perf_counter()
+        self.show_hud = show_hud
+        self.hud_interval = hud_interval
+        self.hud = None
+        self.font = None
+        self.dump = open(dump_path, "w") if dump_path else None
+        if self.dump:
+            self.dump.write(",".join(("frame",) + PHASES) + "\n")
+        self.dumped = 0
+
+    def start_frame(self):
+        self.phase = 0
+        self.last = time.perf_counter()
+
+    def mark(self):
+        now = time.perf_counter()
+        self.times[self.index, self.phase] = now - self.last
+        self.last = now
+        self.phase += 1
+
+    def end_frame(self):
+        self.frame += 1
+        self.index += 1
+        self.count = min(self.count + 1, self.capacity)
+        if self.index == self.capacity:
+            self._write_dump(self.capacity)
+            self.index = 0
+        if self.frame % self.hud_interval == 0:
+            self.hud = None
+
+    def _write_dump(self, rows):
+        if not self.dump:
+            return
+        frames = np.arange(self.dumped, self.dumped + rows)[:, None]
+        np.savetxt(self.dump, np.hstack((frames, self.times[:rows] * 1000)),
+                   fmt=["%d"] + ["%.4f"] * len(PHASES), delimiter=",")
+        self.dumped += rows
+
+    def percentiles(self):
+        # Milliseconds, rows p50/p95/p99, one column per phase plus the whole frame
+        times = self.times[:self.count]
+        times = np.hstack((times, times.sum(axis=1, keepdims=True)))
+        return np.percentile(times, [50, 95, 99], axis=0) * 1000
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.show_hud = not self.show_hud
+            self.hud = None
+
+    def _render_hud(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        p50, p95, p99 = self.percentiles()
+        lines = [f"{'ms':<7}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, a, b, c in zip(PHASES + ("frame",), p50, p95, p99):
+            lines.append(f"{name:<7}{a:>7.2f}{b:>7.2f}{c:>7.2f}")
+        rendered = [self.font.render(line, True, (230, 230, 230)) for line in lines]
+        line_height = self.font.get_linesize()
+        hud = pygame.Surface((max(r.get_width() for r in rendered) + 12,
+                              line_height * len(rendered) + 8), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 170))
+        for i, r in enumerate(rendered):
+            hud.blit(r, (6, 4 + i * line_height))
+        return hud
+
+    def draw(self, screen):
+        if not self.show_hud or self.count == 0:
+            return []
+        if self.hud is None:
+            self.hud = self._render_hud()
+        return screen.blit(self.hud, (10, 10))
+
+    def close(self):
+        if self.dump:
+            self._write_dump(self.index)
+            self.dump.close()
+            self.dump = None
+
+
+class NullProfiler:
+    # Stand-in when profiling is off, so the game loop needs no checks
+    def start_frame(self):
+        pass
+
+    def mark(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def draw(self, screen):
+        return []
+
+    def close(self):
+        pass
@@ -0,0 +1,108 @@
+# raster.py - draw many balls in one NumPy pass
+import numpy as np
+import pygame
+
+
+class BatchRenderer:
+    def __init__(self, screen, paint_background, chunk_pixels=1 << 18):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        # Disc pixels rasterized at a time. The temporary index arrays take
+        # about 40 bytes per pixel, so this bounds memory whatever the radii.
+        self.chunk_pixels = chunk_pixels
+        # One 32-bit BGRA pixel per element; the surface draws straight from
+        # this memory, so what is written here is what gets blitted
+        self.pixels = np.zeros((self.height, self.width), dtype=np.uint32)
+        self.flat = self.pixels.reshape(-1)
+        self.surface = pygame.image.frombuffer(self.pixels, (self.width, self.height), "BGRA")
+        paint_background(self.surface)
+        self.background = self.pixels.copy()
+
+        # Disc offsets of every radius seen so far, concatenated;
+        # mask_start[r] / mask_count[r] locate radius r in them
+        self.offset_x = np.empty(0, dtype=np.int32)
+        self.offset_y = np.empty(0, dtype=np.int32)
+        self.mask_start = np.zeros(1, dtype=np.int64)
+        self.mask_count = np.zeros(1, dtype=np.int64)
+        self.offset_flat = np.empty(0, dtype=np.int64)
+
+    def _disc(self, radius):
+        # Take the pixels from pygame itself so the result matches
+        # pygame.draw.circle exactly
+        side = 2 * radius + 3
+        stamp = pygame.Surface((side, side))
+        pygame.draw.circle(stamp, (255, 255, 255), (radius + 1, radius + 1), radius)
+        xs, ys = np.nonzero(pygame.surfarray.array2d(stamp))
+        return xs - (radius + 1), ys - (radius + 1)
+
+    def _add_masks(self, max_radius):
+        first = len(self.mask_count)
+        offsets_x = [self.offset_x]
+        offsets_y = [self.offset_y]
+        starts = [self.mask_start]
+        counts = [self.mask_count]
+        total = len(self.offset_x)
+        for radius in range(first, max_radius + 1):
+            dx, dy = self._disc(radius)
+            offsets_x.append(dx.astype(np.int32))
+            offsets_y.append(dy.astype(np.int32))
+            starts.append(np.array([total]))
+            counts.append(np.array([len(dx)]))
+            total += len(dx)
+        self.offset_x = np.concatenate(offsets_x)
+        self.offset_y = np.concatenate(offsets_y)
+        self.mask_start = np.concatenate(starts)
+        self.mask_count = np.concatenate(counts)
+        self.offset_flat = self.offset_y.astype(np.int64) * self.width + self.offset_x
+
+    def _spans(self, radii):
+        # Index of every disc pixel in the concatenated offset tables,
+        # generated ball by ball in draw order
+        counts = self.mask_count[radii]
+        total = int(counts.sum())
+        first = np.cumsum(counts) - counts
+        offset = np.arange(total, dtype=np.int64) - np.repeat(first - self.mask_start[radii], counts)
+        return counts, offset
+
+    def _rasterize(self, xs, ys, radii, colors):
+        # Where balls overlap the later one wins, as with consecutive draw
+        # calls. Balls fully on screen need no clipping and are written
+        # through flat indices directly.
+        counts, offset = self._spans(radii)
+        on_screen = ((xs - radii >= 0) & (xs + radii < self.width) &
+                     (ys - radii >= 0) & (ys + radii < self.height))
+        if on_screen.all():
+            base = ys * self.width + xs
+            self.flat[np.repeat(base, counts) + self.offset_flat[offset]] = np.repeat(colors, counts)
+            return
+
+        px = np.repeat(xs, counts) + self.offset_x[offset]
+        py = np.repeat(ys, counts) + self.offset_y[offset]
+        inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        self.flat[py[inside] * self.width + px[inside]] = np.repeat(colors, counts)[inside]
+
+    def _chunks(self, radii):
+        # Consecutive runs of balls, in draw order, with at most chunk_pixels
+        # disc pixels each; a ball larger than that gets a run of its own
+        pixels = np.cumsum(self.mask_count[radii])
+        start = 0
+        while start < len(radii):
+            limit = (pixels[start - 1] if start else 0) + self.chunk_pixels
+            end = max(int(np.searchsorted(pixels, limit, side="right")), start + 1)
+            yield start, end
+            start = end
+
+    def draw(self, x, y, size, color):
+        xs = np.atleast_1d(x).astype(np.int64)
+        ys = np.atleast_1d(y).astype(np.int64)
+        radii = np.maximum(np.atleast_1d(size).astype(np.int64), 0)
+        rgb = np.atleast_2d(np.asarray(color, dtype=np.uint32))
+        packed = (np.uint32(0xFF000000) | (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]).astype(np.uint32)
+
+        if len(radii) and radii.max() >= len(self.mask_count):
+            self._add_masks(int(radii.max()))
+
+        np.copyto(self.pixels, self.background)
+        for start, end in self._chunks(radii):
+            self._rasterize(xs[start:end], ys[start:end], radii[start:end], packed[start:end])
+        return self.screen.blit(self.surface, (0, 0))
@@ -0,0 +1,130 @@
+# recorder.py
+import os
+import queue
+import subprocess
+import threading
+import numpy as np
+import pygame
+
+
+class FrameRecorder:
+    # Output depends on the path:
+    #   *.raw      - memory-mapped file of uint8 RGB frames, shape (frames, height, width, 3)
+    #   directory/ - PNG sequence, frame_000000.png, ...
+    #   otherwise  - piped to ffmpeg as rawvideo (e.g. out.mp4)
+    def __init__(self, path, size, max_frames=None, fps=60, buffers=8, flush_every=120):
+        self.path = path
+        self.width, self.height = size
+        self.count = 0
+        self.flush_every = flush_every
+        self.frames = None
+        self.ffmpeg = None
+        self.pending = queue.Queue()
+        self.free = queue.Queue()
+        self.error = None
+
+        if path.endswith(".raw"):
+            if max_frames is None:
+                raise ValueError("recording to a .raw file needs max_frames")
+            self.mode = "raw"
+            self.frames = np.memmap(path, dtype=np.uint8, mode="w+",
+                                    shape=(max_frames, self.height, self.width, 3))
+        else:
+            if path.endswith(("/", os.sep)) or os.path.isdir(path):
+                self.mode = "png"
+                os.makedirs(path, exist_ok=True)
+            else:
+                self.mode = "pipe"
+                self.ffmpeg = subprocess.Popen(
+                    ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                     "-s", f"{self.width}x{self.height}", "-r", str(fps), "-i", "-",
+                     "-pix_fmt", "yuv420p", path],
+                    stdin=subprocess.PIPE)
+            # A fixed pool of frame buffers: when the writer falls behind,
+            # capture() waits for a free one instead of allocating more
+            for _ in range(buffers):
+                self.free.put(np.empty((self.height, self.width, 3), dtype=np.uint8))
+
+        self.thread = threading.Thread(target=self._write_frames, daemon=True)
+        self.thread.start()
+
+    def capture(self, surface):
+        if self.mode == "raw":
+            self._check()
+        else:
+            # Before locking the surface, this may have to wait for the writer
+            buffer = self._free_buffer()
+        # pixels3d is a view of the surface memory; the only copy made is the
+        # one into the output buffer
+        view = pygame.surfarray.pixels3d(surface)
+        if self.mode == "raw":
+            if self.count >= len(self.frames):
+                del view
+                return False
+            self.frames[self.count] = view.transpose(1, 0, 2)
+            if (self.count + 1) % self.flush_every == 0:
+                self.pending.put((self.count, None))
+        else:
+            buffer[...] = view.transpose(1, 0, 2)
+            self.pending.put((self.count, buffer))
+        del view
+        self.count += 1
+        return True
+
+    def _free_buffer(self):
+        # Wait for the writer to hand a buffer back, but not forever: if it
+        # died (ffmpeg exited, disk full) no buffer will ever come
+        while True:
+            self._check()
+            try:
+                return self.free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def _check(self):
+        if self.error is None and not self.thread.is_alive():
+            self.error = RuntimeError("writer thread stopped")
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError(f"recording to {self.path} failed: {self.error}") from self.error
+
+    def _write_frames(self):
+        try:
+            while True:
+                item = self.pending.get()
+                if item is None:
+                    break
+                index, buffer = item
+                if self.mode == "raw":
+                    self.frames.flush()
+                elif self.mode == "png":
+                    image = pygame.image.frombuffer(buffer, (self.width, self.height), "RGB")
+                    pygame.image.save(image, os.path.join(self.path, f"frame_{index:06d}.png"))
+                    self.free.put(buffer)
+                else:
+                    self.ffmpeg.stdin.write(buffer.data)
+                    self.free.put(buffer)
+        except Exception as error:
+            # Kept for capture() and close() to raise on the main thread
+            self.error = error
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join()
+        if self.mode == "pipe":
+            try:
+                self.ffmpeg.stdin.close()
+            except BrokenPipeError:
+                pass
+            status = self.ffmpeg.wait()
+            if self.error is None and status != 0:
+                self.error = RuntimeError(f"ffmpeg exited with status {status}")
+        self._raise_error()
+        if self.mode == "raw":
+            self.frames.flush()
+            frame_bytes = self.width * self.height * 3
+            self.frames = None
+            # Drop the frames that were reserved but never recorded
+            os.truncate(self.path, self.count * frame_bytes)
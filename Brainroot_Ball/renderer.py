@@ -0,0 +1,46 @@
+# renderer.py
+import pygame
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, paint_background, max_rects=256):
+        self.screen = screen
+        # Background and container never change, so they are painted once
+        self.background = pygame.Surface(screen.get_size())
+        paint_background(self.background)
+        self.max_rects = max_rects
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+        self.pending_full = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def draw(self, *drawables):
+        screen = self.screen
+        background = self.background
+        self.pending_full = self.full_redraw or len(self.previous) > self.max_rects
+        if self.pending_full:
+            screen.blit(background, (0, 0))
+        else:
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+
+        rects = []
+        for drawable in drawables:
+            drawn = drawable.draw(screen)
+            if isinstance(drawn, pygame.Rect):
+                rects.append(drawn)
+            else:
+                rects.extend(drawn)
+        self.current = rects
+
+    def flip(self):
+        # Lots of small rects cost more than one full update
+        if self.pending_full or len(self.current) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.full_redraw = False
@@ -0,0 +1,71 @@
+import argparse
+import sys
+import pygame
+from circle import Circle
+from core import EventLog
+
+HELP = "space: pause  left/right: seek 5 s  up/down: speed x2 / x0.5  home/end: start/end"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Brainroot_Ball event log")
+    parser.add_argument("log", help="event log written with main.py --log")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    parser.add_argument("--start", type=float, default=0.0, help="start at this frame")
+    args = parser.parse_args()
+
+    log = EventLog(args.log)
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 800))
+    pygame.display.set_caption("Kulka w kole - replay")
+    font = pygame.font.Font(None, 24)
+    clock = pygame.time.Clock()
+    circle = Circle((int(log.center[0]), int(log.center[1])), int(log.radius))
+
+    fps = 60
+    time = min(max(args.start, 0.0), log.duration)
+    speed = args.speed
+    paused = False
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    time += 5 * fps
+                elif event.key == pygame.K_LEFT:
+                    time -= 5 * fps
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+                elif event.key == pygame.K_HOME:
+                    time = 0.0
+                elif event.key == pygame.K_END:
+                    time = log.duration
+
+        if not paused:
+            time += speed
+        time = min(max(time, 0.0), log.duration)
+
+        x, y, size, color = log.state_at(time)
+        screen.fill((39, 39, 39))
+        circle.draw(screen)
+        pygame.draw.circle(screen, color, (int(x), int(y)), int(size))
+        status = f"frame {time:.0f}/{log.duration:.0f}  x{speed:g}{'  paused' if paused else ''}"
+        screen.blit(font.render(status, True, (220, 220, 220)), (10, 10))
+        screen.blit(font.render(HELP, True, (140, 140, 140)), (10, 775))
+
+        pygame.display.flip()
+        clock.tick(fps)
+
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
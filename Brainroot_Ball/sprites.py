@@ -0,0 +1,56 @@
+# sprites.py
+from collections import OrderedDict
+import pygame
+import pygame.gfxdraw
+
+
+class SpriteCache:
+    def __init__(self, max_sprites=512, antialias=False):
+        self.max_sprites = max_sprites
+        self.antialias = antialias
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _render(self, radius, color):
+        if self.antialias:
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.gfxdraw.filled_circle(sprite, radius, radius, radius, color)
+            pygame.gfxdraw.aacircle(sprite, radius, radius, radius, color)
+        else:
+            # Same pixels as pygame.draw.circle(screen, color, (x, y), radius)
+            # blitted at (x - radius, y - radius)
+            sprite = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+        return sprite
+
+    def get(self, radius, color):
+        key = (radius, color[0], color[1], color[2], self.antialias)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self._render(radius, (color[0], color[1], color[2]))
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def blit(self, screen, x, y, radius, color):
+        return screen.blit(self.get(radius, color), (x - radius, y - radius))
+
+    def blits(self, screen, xs, ys, radii, colors):
+        get = self.get
+        return screen.blits([(get(radius, color), (x - radius, y - radius))
+                             for x, y, radius, color in zip(xs, ys, radii, colors)])
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"sprites: {len(self.sprites)}/{self.max_sprites}, hits: {self.hits}, "
+                f"misses: {self.misses}, evictions: {self.evictions}, hit rate: {hit_rate:.1%}")
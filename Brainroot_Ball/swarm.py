@@ -0,0 +1,134 @@
+# swarm.py
+import math
+import numpy as np
+import pygame
+from circle import Circle
+from collisions import SpatialGrid, resolve_collisions
+
+# With collisions, at most this fraction of the container can be covered by
+# balls (random close packing of disks is about 0.84)
+FILL_FRACTION = 0.8
+
+
+class BallSwarm:
+    def __init__(self, circle, count, size=10, speed=10, growth=2, max_ratio=0.3,
+                 angle_variation=math.pi / 4, rng=None, collide=False):
+        self.circle = circle
+        # Circles use the analytic fast path, other containers their query()
+        self.analytic = isinstance(circle, Circle)
+        self.count = count
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.growth = growth
+        self.max_size = circle.radius * max_ratio
+        self.angle_variation = angle_variation
+
+        # Struct-of-arrays: one contiguous array per attribute
+        self.x = np.full(count, float(circle.center[0]))
+        self.y = np.full(count, float(circle.center[1]))
+        self.size = np.full(count, float(size))
+        self.speed = np.full(count, float(speed))
+        self.angle = self.rng.uniform(0, 2 * math.pi, count)
+        self.color = self.rng.integers(50, 256, (count, 3), dtype=np.uint8)
+        self.grid = SpatialGrid() if collide else None
+        # Balls touching another ball do not grow at the wall
+        self.touching = np.zeros(count, dtype=bool)
+        self.sprites = None
+        self.trail = None
+        if collide:
+            self.scatter()
+
+    def scatter(self):
+        # Colliding balls can't all start stacked on the center
+        cx, cy = self.circle.center
+        reach = self.circle.radius - self.size
+        distance = reach * np.sqrt(self.rng.uniform(0, 1, self.count))
+        direction = self.rng.uniform(0, 2 * math.pi, self.count)
+        self.x = cx + distance * np.cos(direction)
+        self.y = cy + distance * np.sin(direction)
+
+    def _wall_hits(self):
+        # Indices of balls touching the wall, their outward normals and the
+        # point on the wall to put them back on
+        if self.analytic:
+            cx, cy = self.circle.center
+            max_allowed_distance = self.circle.radius - self.size
+            normal_x = self.x - cx
+            normal_y = self.y - cy
+            distance_from_center = np.sqrt(normal_x**2 + normal_y**2)
+            idx = np.flatnonzero(distance_from_center >= max_allowed_distance)
+            distance = distance_from_center[idx]
+            normal_x = normal_x[idx] / distance
+            normal_y = normal_y[idx] / distance
+            wall_x = cx + max_allowed_distance[idx] * normal_x
+            wall_y = cy + max_allowed_distance[idx] * normal_y
+            return idx, normal_x, normal_y, wall_x, wall_y
+
+        distance, normal_x, normal_y = self.circle.query(self.x, self.y)
+        penetration = distance + self.size
+        idx = np.flatnonzero(penetration >= 0)
+        normal_x = normal_x[idx]
+        normal_y = normal_y[idx]
+        wall_x = self.x[idx] - penetration[idx] * normal_x
+        wall_y = self.y[idx] - penetration[idx] * normal_y
+        return idx, normal_x, normal_y, wall_x, wall_y
+
+    def update(self):
+        cos_a = np.cos(self.angle)
+        sin_a = np.sin(self.angle)
+        self.x += self.speed * cos_a
+        self.y += self.speed * sin_a
+
+        idx, normal_x, normal_y, wall_x, wall_y = self._wall_hits()
+        n = idx.size
+        if n:
+            velocity_x = self.speed[idx] * cos_a[idx]
+            velocity_y = self.speed[idx] * sin_a[idx]
+            dot = velocity_x * normal_x + velocity_y * normal_y
+            angle_variation = self.rng.uniform(-self.angle_variation, self.angle_variation, n)
+            self.angle[idx] = np.arctan2(velocity_y - 2 * dot * normal_y,
+                                         velocity_x - 2 * dot * normal_x) + angle_variation
+            self.color[idx] = self.rng.integers(50, 256, (n, 3), dtype=np.uint8)
+
+            # Snap back onto the wall before growing, same as Ball.update
+            self.x[idx] = wall_x
+            self.y[idx] = wall_y
+
+            size = self.size[idx]
+            growing = (size < self.max_size) & ~self.touching[idx]
+            self.size[idx] = np.where(growing, size + self.growth, size)
+
+        if self.grid is not None:
+            self.touching[:] = False
+            self.touching[resolve_collisions(self, self.grid)] = True
+        if self.trail is not None:
+            self.trail.push(self.x, self.y)
+        return idx
+
+    def is_full(self):
+        if (self.size >= self.max_size).all():
+            return True
+        # Colliding balls can't all reach the stop size once there are more
+        # than a handful; they would only grow into each other. The circle is
+        # full once the balls cover FILL_FRACTION of it.
+        return self.grid is not None and np.pi * np.dot(self.size, self.size) >= FILL_FRACTION * self.circle.area
+
+    def snapshot(self):
+        return (self.x.copy(), self.y.copy(), self.size.copy(), self.color.copy())
+
+    def draw(self, screen):
+        return self.draw_state(screen, self.x, self.y, self.size, self.color, self.trail)
+
+    def draw_state(self, screen, x, y, size, color, trail=None):
+        xs = x.astype(int).tolist()
+        ys = y.astype(int).tolist()
+        sizes = size.astype(int).tolist()
+        colors = color.tolist()
+        rects = []
+        if trail is not None:
+            rects = trail.draw(screen, colors)
+        if self.sprites is not None:
+            rects.extend(self.sprites.blits(screen, xs, ys, sizes, colors))
+            return rects
+        for x, y, size, color in zip(xs, ys, sizes, colors):
+            rects.append(pygame.draw.circle(screen, color, (x, y), size))
+        return rects
@@ -0,0 +1,113 @@
+# sweep.py - Monte Carlo parameter sweep over display-free simulations
+import argparse
+import csv
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from core import Simulation
+
+CENTER = (400, 400)
+RADIUS = 300
+FIELDS = ["replicate", "speed", "growth", "angle_variation", "max_ratio", "seed",
+          "frames", "bounces", "full"]
+DTYPES = [int, float, float, float, float, int, int, int, int]
+# A run is identified by its parameters and seed. The seed comes from the
+# replicate number, never from the run's position in the grid, so adding
+# values to a parameter list leaves every existing run as it was.
+KEY = ["speed", "growth", "angle_variation", "max_ratio", "seed"]
+
+
+def run_key(speed, growth, angle_variation, max_ratio, seed):
+    return (float(speed), float(growth), float(angle_variation), float(max_ratio), int(seed))
+
+
+def build_runs(args):
+    # Replicate r of every combination uses the same seed, so combinations
+    # are compared on the same random bounce sequences
+    grid = itertools.product(args.speed, args.growth, args.angle_variation, args.max_ratio,
+                             range(args.runs))
+    return [(replicate, speed, growth, angle_variation, max_ratio, args.seed + replicate)
+            for speed, growth, angle_variation, max_ratio, replicate in grid]
+
+
+def simulate(runs, max_frames):
+    results = []
+    for replicate, speed, growth, angle_variation, max_ratio, seed in runs:
+        sim = Simulation(CENTER, RADIUS, seed=seed, speed=speed, growth=growth,
+                         max_ratio=max_ratio, angle_variation=angle_variation)
+        frames = sim.run(max_frames)
+        results.append((replicate, speed, growth, angle_variation, max_ratio, seed,
+                        frames, sim.bounces, int(sim.is_full())))
+    return results
+
+
+def finished_runs(path):
+    if not os.path.exists(path):
+        return set()
+    # An interrupted run can leave half a line at the end
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+    with open(path, newline="") as f:
+        return {run_key(*(row[name] for name in KEY)) for row in csv.DictReader(f)}
+
+
+def write_npy(csv_path, npy_path):
+    with open(csv_path, newline="") as f:
+        rows = sorted((tuple(cast(value) for cast, value in zip(DTYPES, row))
+                       for row in itertools.islice(csv.reader(f), 1, None)))
+    dtype = [(name, np.int64 if cast is int else np.float64) for name, cast in zip(FIELDS, DTYPES)]
+    np.save(npy_path, np.array(rows, dtype=dtype))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded Brainroot_Ball simulations over a parameter grid")
+    parser.add_argument("--speed", type=float, nargs="+", default=[10.0])
+    parser.add_argument("--growth", type=float, nargs="+", default=[2.0])
+    parser.add_argument("--angle-variation", type=float, nargs="+", default=[math.pi / 4],
+                        help="maximum random angle change per bounce [rad]")
+    parser.add_argument("--max-ratio", type=float, nargs="+", default=[0.3],
+                        help="stop when the ball radius reaches this fraction of the circle radius")
+    parser.add_argument("--runs", type=int, default=100, help="seeded runs per parameter combination")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first replicate; replicate r uses seed + r")
+    parser.add_argument("--max-frames", type=int, default=1_000_000, help="give up on a run after this many frames")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=64, help="runs per task sent to a worker")
+    parser.add_argument("--out", default="sweep.csv", help="CSV file, appended to and resumed from")
+    parser.add_argument("--npy", help="also write all results as a structured .npy array when done")
+    args = parser.parse_args()
+
+    done = finished_runs(args.out)
+    runs = build_runs(args)
+    todo = [run for run in runs if run_key(*run[1:]) not in done]
+    print(f"{len(runs) - len(todo)} of {len(runs)} runs already in {args.out}, {len(todo)} to go")
+    runs = todo
+
+    new_file = not os.path.exists(args.out) or os.path.getsize(args.out) == 0
+    with open(args.out, "a", newline="") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(FIELDS)
+            f.flush()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(simulate, runs[i:i + args.chunk], args.max_frames)
+                       for i in range(0, len(runs), args.chunk)]
+            completed = 0
+            for future in as_completed(futures):
+                results = future.result()
+                writer.writerows(results)
+                f.flush()
+                completed += len(results)
+                print(f"\r{completed}/{len(runs)}", end="", flush=True)
+    print()
+
+    if args.npy:
+        write_npy(args.out, args.npy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# trails.py - fading motion trails in a preallocated ring buffer
+import numpy as np
+import pygame
+
+
+class Trails:
+    # Last `length` positions of `count` balls. Every point is written twice,
+    # at head and head + length, so the newest points of a ball are always
+    # one contiguous slice of its row and go to pygame.draw.lines as they are:
+    # nothing is allocated or copied per frame.
+    def __init__(self, count=1, length=32, bands=4, width=2, background=(47, 47, 47)):
+        self.length = length
+        self.points = np.zeros((count, 2 * length, 2))
+        self.head = 0
+        self.filled = 0
+        # Each band is one draw.lines call, older bands blend further into
+        # the background; bands=1 draws the whole trail in one call
+        self.bands = bands
+        self.width = width
+        self.background = tuple(background)[:3]
+        # Fraction of the trail that gets drawn, lowered by the governor
+        self.scale = 1.0
+
+    def push(self, x, y):
+        head = self.head
+        points = self.points
+        points[:, head, 0] = points[:, head + self.length, 0] = x
+        points[:, head, 1] = points[:, head + self.length, 1] = y
+        self.head = (head + 1) % self.length
+        if self.filled < self.length:
+            self.filled += 1
+
+    def clear(self):
+        self.head = 0
+        self.filled = 0
+
+    def draw(self, screen, colors):
+        visible = min(self.filled, max(int(self.length * self.scale), 2))
+        if visible < 2:
+            return []
+        end = self.head + self.length
+        start = end - visible
+        bands = min(self.bands, visible - 1)
+        # Band edges share a point so the trail has no gaps
+        edges = [start + (visible - 1) * band // bands for band in range(bands + 1)]
+        br, bg, bb = self.background
+        rects = []
+        for row, color in zip(self.points, colors):
+            r, g, b = color[0], color[1], color[2]
+            for band in range(bands):
+                fade = (band + 1) / (bands + 1)
+                band_color = (br + (r - br) * fade, bg + (g - bg) * fade, bb + (b - bb) * fade)
+                rects.append(pygame.draw.lines(screen, band_color, False,
+                                               row[edges[band]:edges[band + 1] + 1], self.width))
+        return rects
@@ -0,0 +1,116 @@
+# curves.py - function curves resampled for the visible part of a plot
+from collections import OrderedDict
+import math
+import numpy as np
+
+
+class AdaptiveCurve:
+    # Samples func over whatever x range the plot shows, at (at least) one
+    # point per pixel. The x axis is cut into tiles of TILE_SAMPLES points at
+    # power-of-two densities; tiles are cached, so panning back or returning
+    # to a zoom level reuses them instead of evaluating func again.
+    TILE_SAMPLES = 256
+
+    def __init__(self, plot, item, func, poles=None, clip=None, jump=None, cache_size=64):
+        # poles: (offset, period) of the points where func is undefined, e.g.
+        # (pi/2, pi) for tan; the curve is broken there exactly.
+        # clip: limit for |y| so values next to a pole stay drawable
+        # jump: for functions whose poles are not known in advance, break the
+        # curve wherever two neighbouring samples differ by more than this
+        self.view = plot.getViewBox()
+        self.item = item
+        self.func = func
+        self.poles = poles
+        self.clip = clip
+        self.jump = jump
+        self.cache_size = cache_size
+        self.tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.shown = None
+        self.view.sigXRangeChanged.connect(self.refresh)
+        self.view.sigResized.connect(self.refresh)
+
+    def _level(self, x0, x1):
+        pixels = max(self.view.width(), 100.0)
+        pixels_per_unit = pixels / max(x1 - x0, 1e-12)
+        return math.ceil(math.log2(pixels_per_unit))
+
+    def _tile(self, level, index):
+        key = (level, index)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+
+        self.misses += 1
+        step = 2.0 ** -level
+        n = self.TILE_SAMPLES
+        x = (index * n + np.arange(n)) * step
+        breaks = None
+        if self.poles is not None:
+            x, breaks = self._insert_poles(x, x[0], x[0] + n * step, step)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = self.func(x)
+        if self.clip is not None:
+            np.clip(y, -self.clip, self.clip, out=y)
+        if breaks is not None:
+            y[breaks] = np.nan
+        tile = (x, y)
+        self.tiles[key] = tile
+        if len(self.tiles) > self.cache_size:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def _insert_poles(self, x, start, end, step):
+        # Right at each pole: one point just before, a NaN break, one just
+        # after, so the curve runs up to the asymptote and is never joined
+        # across it. Only while there is more than one sample per period:
+        # zoomed out further the samples can't show the shape anyway, and a
+        # tile would get three extra points per period in range.
+        offset, period = self.poles
+        if step >= period:
+            return x, None
+        first = math.ceil((start - offset) / period)
+        last = math.floor((end - offset) / period)
+        poles = offset + np.arange(first, last + 1) * period
+        poles = poles[(poles >= start) & (poles < end)]
+        if not poles.size:
+            return x, None
+        delta = step * 1e-3
+        extra = np.column_stack((poles - delta, poles, poles + delta)).ravel()
+        x = np.sort(np.concatenate((x, extra)))
+        return x, np.isin(x, poles)
+
+    def _break_jumps(self, x, y):
+        # A NaN halfway between the two samples around each jump
+        cut = np.flatnonzero(np.abs(np.diff(y)) > self.jump) + 1
+        if not cut.size:
+            return x, y
+        middle = (x[cut - 1] + x[cut]) / 2
+        return np.insert(x, cut, middle), np.insert(y, cut, np.nan)
+
+    def set_func(self, func):
+        self.func = func
+        self.tiles.clear()
+        self.shown = None
+        self.refresh()
+
+    def refresh(self, *args):
+        (x0, x1), _ = self.view.viewRange()
+        level = self._level(x0, x1)
+        span = self.TILE_SAMPLES * 2.0 ** -level
+        first = math.floor(x0 / span)
+        last = math.floor(x1 / span)
+        if (level, first, last) == self.shown:
+            return
+        self.shown = (level, first, last)
+
+        tiles = [self._tile(level, index) for index in range(first, last + 1)]
+        x = np.concatenate([tile[0] for tile in tiles])
+        y = np.concatenate([tile[1] for tile in tiles])
+        if self.jump is not None:
+            # After joining the tiles, so a jump across a tile edge is found too
+            x, y = self._break_jumps(x, y)
+        self.item.setData(x, y, connect="finite")
@@ -0,0 +1,123 @@
+# export.py - render the unit circle and function panels at many angles, no window
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+# One application and window per worker process, built by _start_worker
+_qapp = None
+_window = None
+
+
+def parse_angles(specs):
+    # "30 45 60" and ranges "start:stop:step" with stop included, e.g. 0:360:15
+    angles = []
+    for spec in specs:
+        try:
+            numbers = [float(part) for part in spec.split(":")]
+        except ValueError:
+            raise ValueError(f"bad angle {spec!r}, expected a number or start:stop:step") from None
+        if len(numbers) not in (1, 3):
+            raise ValueError(f"bad angle {spec!r}, expected a number or start:stop:step")
+        if not all(np.isfinite(numbers)):
+            raise ValueError(f"angles must be finite in {spec!r}")
+        if len(numbers) == 3:
+            start, stop, step = numbers
+            if step <= 0:
+                raise ValueError(f"step must be positive in {spec!r}")
+            count = int(np.floor((stop - start) / step + 1e-9)) + 1
+            angles.extend(round(start + i * step, 6) for i in range(max(count, 0)))
+        else:
+            angles.append(numbers[0])
+    if not angles:
+        raise ValueError("no angles to export")
+    return angles
+
+
+def frame_name(angle_deg):
+    return f"angle_{angle_deg:06.2f}"
+
+
+def _start_worker(antialias, expression):
+    # Each process has its own QApplication and window. The platform has to
+    # be set before the QApplication exists.
+    global _qapp, _window
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    import pyqtgraph as pg
+    from PyQt6 import QtWidgets
+    from main import UnitCircleVisualizerPyQtGraph
+
+    pg.setConfigOptions(antialias=antialias)
+    _qapp = QtWidgets.QApplication([])
+    _window = UnitCircleVisualizerPyQtGraph(lazy=False)
+    if expression:
+        _window.expression_textbox.setText(expression)
+        _window._plot_expression()
+    _qapp.processEvents()
+
+
+def _export_svg_qt(scene, path):
+    # Plain Qt SVG of the scene. pyqtgraph's SVGExporter cannot parse the
+    # path data some Qt 6 versions write ("... Z" fails to unpack), so it is
+    # the fallback.
+    from PyQt6 import QtGui, QtSvg
+
+    rect = scene.sceneRect()
+    generator = QtSvg.QSvgGenerator()
+    generator.setFileName(path)
+    generator.setSize(rect.size().toSize())
+    generator.setViewBox(rect)
+    painter = QtGui.QPainter(generator)
+    scene.render(painter, rect, rect)
+    painter.end()
+
+
+def _render(angles, out_dir, formats, width):
+    import pyqtgraph.exporters
+
+    scene = _window.win.scene()
+    exporters = {}
+    for fmt in formats:
+        if fmt == "png":
+            exporter = pyqtgraph.exporters.ImageExporter(scene)
+            if width:
+                exporter.parameters()["width"] = width
+        else:
+            exporter = pyqtgraph.exporters.SVGExporter(scene)
+        exporters[fmt] = exporter
+
+    paths = []
+    for angle_deg in angles:
+        _window._update_visuals(angle_deg)
+        for fmt, exporter in list(exporters.items()):
+            path = os.path.join(out_dir, f"{frame_name(angle_deg)}.{fmt}")
+            if exporter is None:
+                _export_svg_qt(scene, path)
+            else:
+                try:
+                    exporter.export(path)
+                except ValueError:
+                    if fmt != "svg":
+                        raise
+                    _export_svg_qt(scene, path)
+                    exporters[fmt] = None
+            paths.append(path)
+    return paths
+
+
+def export(angles, out_dir, formats=("png",), width=None, workers=None, chunk=8,
+           antialias=False, expression=None):
+    os.makedirs(out_dir, exist_ok=True)
+    # spawn, not fork: a forked child would share the parent's Qt state
+    context = multiprocessing.get_context("spawn")
+    tasks = [angles[i:i + chunk] for i in range(0, len(angles), chunk)]
+    start = time.perf_counter()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_start_worker,
+                             initargs=(antialias, expression)) as pool:
+        futures = [pool.submit(_render, task, out_dir, tuple(formats), width) for task in tasks]
+        for future in as_completed(futures):
+            done += len(future.result())
+            print(f"\r{done}/{len(angles) * len(formats)} files", end="", flush=True)
+    print(f"\n{len(angles)} angles in {time.perf_counter() - start:.1f} s -> {out_dir}")
@@ -0,0 +1,224 @@
+# expressions.py - user-typed functions of x compiled to vectorized NumPy code
+#
+#   f = compile_expression("sin(3x)*cos(x)")
+#   y = f(np.linspace(0, 2 * np.pi, 500))
+#
+# The text is parsed by a small recursive-descent parser that only knows
+# numbers, x, a few constants and the functions below, and turned into one
+# NumPy expression. Nothing the user types is ever passed to eval() as is.
+import functools
+import math
+import re
+import numpy as np
+
+# name -> (number of arguments, NumPy code)
+FUNCTIONS = {
+    "sin": (1, "np.sin({0})"),
+    "cos": (1, "np.cos({0})"),
+    "tan": (1, "np.tan({0})"),
+    "sec": (1, "(1 / np.cos({0}))"),
+    "csc": (1, "(1 / np.sin({0}))"),
+    "cot": (1, "(1 / np.tan({0}))"),
+    "asin": (1, "np.arcsin({0})"),
+    "acos": (1, "np.arccos({0})"),
+    "atan": (1, "np.arctan({0})"),
+    "atan2": (2, "np.arctan2({0}, {1})"),
+    "sinh": (1, "np.sinh({0})"),
+    "cosh": (1, "np.cosh({0})"),
+    "tanh": (1, "np.tanh({0})"),
+    "exp": (1, "np.exp({0})"),
+    "ln": (1, "np.log({0})"),
+    "log": (1, "np.log({0})"),
+    "log10": (1, "np.log10({0})"),
+    "sqrt": (1, "np.sqrt({0})"),
+    "abs": (1, "np.abs({0})"),
+    "floor": (1, "np.floor({0})"),
+    "ceil": (1, "np.ceil({0})"),
+}
+CONSTANTS = {"pi": "np.pi", "π": "np.pi", "tau": "(2 * np.pi)", "e": "np.e"}
+VARIABLES = {"x": "x", "θ": "x"}
+# Longest first, so "sinh" wins over "sin" when splitting "sinhx"
+NAMES = sorted([*FUNCTIONS, *CONSTANTS, *VARIABLES], key=len, reverse=True)
+
+TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+)|([A-Za-zπθ_][A-Za-z0-9πθ_]*)|(\*\*|[-+*/^(),]))")
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if not match:
+            raise ExpressionError(f"unexpected {text[position:].strip()[:1]!r} at position {position}")
+        number, name, operator = match.groups()
+        if number:
+            tokens.append(("number", number))
+        elif name:
+            tokens.extend(("name", part) for part in split_name(name))
+        else:
+            tokens.append(("op", "^" if operator == "**" else operator))
+        position = match.end()
+    return tokens
+
+
+def split_name(name):
+    # "sinx" -> sin, x; "2pix" is split by the tokenizer into 2 and "pix"
+    parts = []
+    while name:
+        for known in NAMES:
+            if name.startswith(known):
+                parts.append(known)
+                name = name[len(known):]
+                break
+        else:
+            raise ExpressionError(f"unknown name {name!r}")
+    return parts
+
+
+class Parser:
+    # expr    := term (("+" | "-") term)*
+    # term    := unary (("*" | "/") unary | unary)*     juxtaposition multiplies
+    # unary   := ("-" | "+") unary | power
+    # power   := primary ("^" unary)?
+    # primary := number | x | constant | "(" expr ")" | function call
+    # A function call is name "(" args ")", or name followed by an implicit
+    # product without functions in it: "sin 3x" is sin(3x), "sin x cos x"
+    # is sin(x) * cos(x).
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            found = token[1] if token[0] else "end of input"
+            raise ExpressionError(f"expected {value or 'more input'}, found {found!r}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("empty expression")
+        code = self.expr()
+        if self.peek()[0] is not None:
+            raise ExpressionError(f"unexpected {self.peek()[1]!r}")
+        return code
+
+    def expr(self):
+        code = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            operator = self.take()[1]
+            code = f"{code} {operator} {self.term()}"
+        return code
+
+    def starts_primary(self, allow_functions=True):
+        kind, value = self.peek()
+        if kind == "number" or (kind == "op" and value == "("):
+            return True
+        if kind == "name":
+            return allow_functions or value not in FUNCTIONS
+        return False
+
+    def term(self, allow_functions=True):
+        code = self.unary()
+        while True:
+            if allow_functions and self.peek() in (("op", "*"), ("op", "/")):
+                operator = self.take()[1]
+                code = f"{code} {operator} {self.unary()}"
+            elif self.starts_primary(allow_functions):
+                code = f"{code} * {self.unary()}"
+            else:
+                return code
+
+    def unary(self):
+        if self.peek() in (("op", "-"), ("op", "+")):
+            operator = self.take()[1]
+            return f"({operator}{self.unary()})"
+        return self.power()
+
+    def power(self):
+        code = self.primary()
+        if self.peek() == ("op", "^"):
+            self.take()
+            code = f"{code} ** {self.unary()}"
+        return f"({code})" if " " in code and not code.startswith("(") else code
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "number":
+            # A NumPy scalar, so 1/0 or 9^9^9 give inf like the arrays do
+            # instead of raising. 1e999 is already inf, which has no literal.
+            number = float(value)
+            return f"np.float64({number!r})" if math.isfinite(number) else "np.float64(np.inf)"
+        if kind == "op" and value == "(":
+            code = self.expr()
+            self.take(")")
+            return f"({code})"
+        if kind == "name" and value in VARIABLES:
+            return VARIABLES[value]
+        if kind == "name" and value in CONSTANTS:
+            return CONSTANTS[value]
+        if kind == "name":
+            return self.call(value)
+        raise ExpressionError(f"unexpected {value!r}")
+
+    def call(self, name):
+        count, template = FUNCTIONS[name]
+        if self.peek() == ("op", "("):
+            self.take("(")
+            args = [self.expr()]
+            while self.peek() == ("op", ","):
+                self.take(",")
+                args.append(self.expr())
+            self.take(")")
+        else:
+            args = [self.term(allow_functions=False)]
+        if len(args) != count:
+            raise ExpressionError(f"{name} takes {count} argument(s), got {len(args)}")
+        return template.format(*args)
+
+
+@functools.lru_cache(maxsize=256)
+def normalize(text):
+    # Canonical NumPy code for the text; "sin(3x)", "sin 3x" and "sin(3 * x)"
+    # all give the same string
+    try:
+        return Parser(tokenize(text)).parse()
+    except RecursionError:
+        raise ExpressionError("expression is nested too deeply") from None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(code):
+    try:
+        function = eval(f"lambda x: {code}", {"__builtins__": {}, "np": np})
+    except (RecursionError, MemoryError, SyntaxError):
+        # Python's own compiler has lower nesting limits than the parser
+        raise ExpressionError("expression is nested too deeply") from None
+
+    def vectorized(x):
+        x = np.asarray(x, dtype=float)
+        with np.errstate(all="ignore"):
+            y = function(x)
+        # Constant expressions give a scalar
+        if np.ndim(y) != x.ndim:
+            return np.broadcast_to(np.asarray(y, dtype=float), x.shape).copy()
+        # "x" alone gives back the caller's array; callers may write to the result
+        return y.copy() if y is x else y
+    vectorized.code = code
+    return vectorized
+
+
+def compile_expression(text):
+    # Compiled once per distinct expression, however it was typed
+    return _compile(normalize(text))
@@ -1,26 +1,249 @@
+import argparse
+from collections import deque
+import functools
+import os
 import sys
+import time
+IMPORT_START = time.perf_counter()
 import numpy as np
 import pyqtgraph as pg
 from PyQt6 import QtWidgets, QtCore, QtGui
 import math
+from curves import AdaptiveCurve
+from expressions import ExpressionError, compile_expression
+from trig import tangent
+IMPORT_END = time.perf_counter()
 
 pg.setConfigOption('background', 'w')
 pg.setConfigOption('foreground', 'k')
 
+ARC_RADIUS = 0.35
+LABEL_RADIUS = 0.45
+MAJOR_TICKS_X = [
+    (0, '0'), (np.pi/2, 'π/2'), (np.pi, 'π'),
+    (3*np.pi/2, '3π/2'), (2*np.pi, '2π')
+]
+
+
+@functools.lru_cache(maxsize=4096)
+def label_texts(angle_deg, angle_rad, sin_a, cos_a, tan_text_val):
+    # One entry per 0.1° slider step, so revisited angles are not formatted again
+    sin_color = "purple"
+    cos_color = "green"
+    tan_color = "saddlebrown"
+    return (f"Angle [deg]: {angle_deg:.1f}°",
+            f"Angle [rad]: {angle_rad:.4f}",
+            f"Sine: <font color='{sin_color}'>{sin_a:.4f}</font>",
+            f"Cosine: <font color='{cos_color}'>{cos_a:.4f}</font>",
+            f"Tangent: <font color='{tan_color}'>{tan_text_val}</font>")
+
+
+def segment_item(pen):
+    # A unit segment from (0, 0) to (1, 0); place_segment() moves it with
+    # the item transform instead of new data
+    return pg.PlotDataItem([0, 1], [0, 0], pen=pen)
+
+
+def place_segment(item, x0, y0, x1, y1):
+    dx = x1 - x0
+    dy = y1 - y0
+    if dx == 0 and dy == 0:
+        # Zero length: nothing to draw and the transform would not be invertible
+        dx = 1e-12
+    # Rotation + scale mapping (0, 0) to (x0, y0) and (1, 0) to (x1, y1);
+    # pens are cosmetic, so the line width stays the same
+    item.setTransform(QtGui.QTransform(dx, dy, -dy, dx, x0, y0))
+
+class UpdateScheduler(QtCore.QObject):
+    # Keeps only the latest requested angle and hands it to `update` at most
+    # once per display frame. Slider drags fire valueChanged far more often
+    # than the screen refreshes; the angles in between are never drawn.
+    def __init__(self, update, parent=None):
+        super().__init__(parent)
+        self.update = update
+        self.pending = None
+        self.shown = None
+        self.last_flush = 0.0
+        self.requested = 0
+        self.flushed = 0
+        self.dropped = 0
+
+        screen = QtGui.QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        self.frame_interval = 1.0 / (refresh_rate if refresh_rate > 0 else 60.0)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.flush)
+
+    @property
+    def merged(self):
+        # Requests replaced by a newer one before they were drawn
+        return self.requested - self.flushed - self.dropped - (self.pending is not None)
+
+    def request(self, angle_deg):
+        self.requested += 1
+        if self.pending is None and angle_deg == self.shown:
+            # Already on screen, e.g. the textbox re-submitting the slider value
+            self.dropped += 1
+            return
+        self.pending = angle_deg
+        if not self.timer.isActive():
+            wait = self.last_flush + self.frame_interval - time.perf_counter()
+            self.timer.start(max(round(wait * 1000), 0))
+
+    def flush(self):
+        if self.pending is None:
+            return
+        angle_deg, self.pending = self.pending, None
+        self._show(angle_deg)
+
+    def show_now(self, angle_deg):
+        # For callers that already run once per frame, like the animation:
+        # draw right away, replacing anything pending, and remember the angle
+        # so later requests compare against what is really on screen
+        self.timer.stop()
+        self.pending = None
+        self.requested += 1
+        self._show(angle_deg)
+
+    def _show(self, angle_deg):
+        self.last_flush = time.perf_counter()
+        self.flushed += 1
+        self.shown = angle_deg
+        self.update(angle_deg)
+
+    def stats(self):
+        return (f"angle updates: {self.requested} requested, {self.flushed} drawn, "
+                f"{self.merged} merged, {self.dropped} dropped")
+
+
+class AngleAnimator(QtCore.QObject):
+    # Sweeps the angle at `speed` deg/s from a timer firing once per display
+    # frame. The angle follows the clock, not the number of ticks, so a late
+    # frame does not slow the sweep down. Frame-to-frame times are kept for
+    # the fps and jitter report.
+    def __init__(self, update, frame_interval, parent=None, history=600):
+        super().__init__(parent)
+        self.update = update
+        self.frame_interval = frame_interval
+        self.next_frame = 0.0
+        self.speed = 45.0
+        self.angle_deg = 0.0
+        self.start_angle = 0.0
+        self.start_time = 0.0
+        self.last_frame = None
+        self.frame_times = deque(maxlen=history)
+
+        # Single-shot, restarted towards the next frame's deadline each tick.
+        # A fixed interval can only be whole milliseconds: 16 ms is 62.5 fps
+        # instead of 60. Aiming at deadlines alternates 16 and 17 ms and
+        # averages out to the real frame interval.
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.active = False
+
+    @property
+    def running(self):
+        return self.active
+
+    def start(self, angle_deg):
+        self.angle_deg = angle_deg
+        self._anchor()
+        self.last_frame = None
+        self.frame_times.clear()
+        self.active = True
+        self.next_frame = time.perf_counter()
+        self._schedule()
+
+    def stop(self):
+        self.active = False
+        self.timer.stop()
+
+    def _schedule(self):
+        self.next_frame += self.frame_interval
+        now = time.perf_counter()
+        if self.next_frame < now:
+            # A frame took too long: carry on from now instead of firing a
+            # burst of ticks to catch up
+            self.next_frame = now
+        self.timer.start(round((self.next_frame - now) * 1000))
+
+    def set_speed(self, speed):
+        self._anchor()
+        self.speed = speed
+
+    def _anchor(self):
+        # Continue from the current angle, e.g. after a speed change
+        self.start_angle = self.angle_deg
+        self.start_time = time.perf_counter()
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+        self.angle_deg = (self.start_angle + self.speed * (now - self.start_time)) % 360.0
+        self.update(self.angle_deg)
+        if self.active:
+            self._schedule()
+
+    def stats(self):
+        if len(self.frame_times) < 2:
+            return "animation: no frames yet"
+        frame_times = np.array(self.frame_times) * 1000
+        return (f"animation: {1000 / frame_times.mean():.1f} fps, frame time {frame_times.mean():.2f} ms "
+                f"± {frame_times.std():.2f} ms jitter, p99 {np.percentile(frame_times, 99):.2f} ms, "
+                f"max {frame_times.max():.2f} ms")
+
+
 class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
-    def __init__(self):
+    def __init__(self, lazy=False, print_timing=False):
         super().__init__()
         self.initial_angle_deg = 30.0
         self.current_angle_deg = self.initial_angle_deg
         self.current_angle_rad = math.radians(self.current_angle_deg)
         self.tan_limit = 5
+        self.startup = {"imports": IMPORT_END}
+        self.print_timing = print_timing
+        self.function_plots_ready = False
+        self.custom_plot = None
 
         self._setup_ui()
         self._setup_plots()
+        if not lazy:
+            self._setup_function_plots()
+        self.scheduler = UpdateScheduler(self._update_visuals, self)
+        self.animator = AngleAnimator(self._animate_frame, self.scheduler.frame_interval, self)
         self._connect_signals()
-        self._update_visuals(self.current_angle_deg)
+        self.scheduler.request(self.current_angle_deg)
+        self.scheduler.flush()
+        self._startup_step("window built")
         self.show()
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first paint" not in self.startup:
+            self._startup_step("first paint")
+            if not self.function_plots_ready:
+                # Let the first frame reach the screen, then build the rest
+                QtCore.QTimer.singleShot(0, self._setup_function_plots)
+
+    def _startup_step(self, name):
+        self.startup[name] = time.perf_counter()
+        if self.print_timing and self.function_plots_ready and "first paint" in self.startup \
+                and "reported" not in self.startup:
+            self.startup["reported"] = True
+            print(self.startup_report())
+
+    def startup_report(self):
+        # Milliseconds since this module started importing numpy
+        steps = sorted((t, name) for name, t in self.startup.items() if name != "reported")
+        return "startup: " + ", ".join(f"{name} {(t - IMPORT_START) * 1000:.0f} ms" for t, name in steps)
+
     def _setup_ui(self):
         self.setWindowTitle("SinCosTanApp")
         self.setGeometry(100, 100, 1300, 850)
@@ -62,6 +285,36 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
         self.reset_button = QtWidgets.QPushButton("Reset")
         control_layout.addWidget(self.reset_button, alignment=QtCore.Qt.AlignmentFlag.AlignCenter)
 
+        animate_layout = QtWidgets.QHBoxLayout()
+        self.animate_button = QtWidgets.QPushButton("Animate")
+        self.animate_button.setCheckable(True)
+        speed_label = QtWidgets.QLabel("Speed [deg/s]:")
+        self.speed_spinbox = QtWidgets.QDoubleSpinBox()
+        self.speed_spinbox.setRange(-720.0, 720.0)
+        self.speed_spinbox.setDecimals(1)
+        self.speed_spinbox.setSingleStep(5.0)
+        self.speed_spinbox.setValue(45.0)
+        self.fps_label = QtWidgets.QLabel("")
+        animate_layout.addWidget(self.animate_button)
+        animate_layout.addWidget(speed_label)
+        animate_layout.addWidget(self.speed_spinbox)
+        animate_layout.addWidget(self.fps_label)
+        animate_layout.addStretch()
+        control_layout.addLayout(animate_layout)
+
+        expression_layout = QtWidgets.QHBoxLayout()
+        expression_label = QtWidgets.QLabel("f(x) =")
+        self.expression_textbox = QtWidgets.QLineEdit()
+        self.expression_textbox.setPlaceholderText("e.g. sin(3x)*cos(x), sec x, atan2(sin x, cos x)")
+        self.plot_expression_button = QtWidgets.QPushButton("Plot")
+        self.expression_error_label = QtWidgets.QLabel("")
+        self.expression_error_label.setStyleSheet("color: red")
+        expression_layout.addWidget(expression_label)
+        expression_layout.addWidget(self.expression_textbox)
+        expression_layout.addWidget(self.plot_expression_button)
+        expression_layout.addWidget(self.expression_error_label)
+        control_layout.addLayout(expression_layout)
+
         common_angles = [0, 30, 45, 60, 90, 120, 135, 150, 180, 210, 225, 240, 270, 300, 315, 330, 360]
         button_grid = QtWidgets.QGridLayout()
         buttons_per_row = 9
@@ -102,33 +355,6 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
             self.text_layout.addWidget(label, alignment=QtCore.Qt.AlignmentFlag.AlignLeft)
         self.text_layout.addStretch()
 
-        self.plot_sine = self.win.addPlot(row=0, col=1, title="Sine Function")
-        self.plot_cosine = self.win.addPlot(row=1, col=1, title="Cosine Function")
-        self.plot_tangent = self.win.addPlot(row=2, col=1, title="Tangent Function")
-
-        major_ticks_x = [
-            (0, '0'), (np.pi/2, 'π/2'), (np.pi, 'π'),
-            (3*np.pi/2, '3π/2'), (2*np.pi, '2π')
-        ]
-
-        for plot in [self.plot_sine, self.plot_cosine, self.plot_tangent]:
-            plot.setXRange(0, 2 * np.pi)
-            plot.showGrid(x=True, y=True, alpha=0.3)
-            ax = plot.getAxis('bottom')
-            ax.setTicks([major_ticks_x])
-            plot.getAxis('left').setLabel('Value', units=None)
-
-        self.plot_sine.setYRange(-1.1, 1.1)
-        self.plot_cosine.setYRange(-1.1, 1.1)
-        self.plot_tangent.setYRange(-self.tan_limit*1.1, self.tan_limit*1.1)
-
-        tan_asymptote_pen = pg.mkPen(color=(180, 180, 180), style=QtCore.Qt.PenStyle.DashLine, width=1)
-        self.tan_asymptote1 = pg.InfiniteLine(pos=np.pi/2, angle=90, pen=tan_asymptote_pen)
-        self.tan_asymptote2 = pg.InfiniteLine(pos=3*np.pi/2, angle=90, pen=tan_asymptote_pen)
-        self.plot_tangent.addItem(self.tan_asymptote1)
-        self.plot_tangent.addItem(self.tan_asymptote2)
-        self.plot_tangent.getViewBox().setLimits(yMin=-self.tan_limit*1.2, yMax=self.tan_limit*1.2)
-
         self.main_layout.addWidget(self.win, 0, 0)
         self.main_layout.addWidget(self.text_widget, 0, 1)
         self.main_layout.addWidget(control_widget, 1, 0, 1, 2)
@@ -146,19 +372,24 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
         self.plot_circle.addItem(pg.InfiniteLine(pos=0, angle=90, pen=axis_pen))
         self.plot_circle.addItem(pg.InfiniteLine(pos=0, angle=0, pen=axis_pen))
 
-        self.angle_line_item = pg.PlotDataItem(pen=pg.mkPen('red', width=2.5))
-        self.point_item = pg.PlotDataItem(pen=None, symbol='o', symbolBrush='red', symbolSize=9)
-        self.sin_line_item = pg.PlotDataItem(pen=pg.mkPen('purple', style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
-        self.cos_line_item = pg.PlotDataItem(pen=pg.mkPen('green', style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
+        self.angle_line_item = segment_item(pen=pg.mkPen('red', width=2.5))
+        self.point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol='o', brush='red', size=9)
+        self.sin_line_item = segment_item(pen=pg.mkPen('purple', style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
+        self.cos_line_item = segment_item(pen=pg.mkPen('green', style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
 
         tangent_color = QtGui.QColor(165, 42, 42)
         tangent_extend_color = QtGui.QColor(165, 42, 42, 180)
 
-        self.tangent_line_item = pg.PlotDataItem(pen=pg.mkPen(tangent_color, style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
-        self.tangent_point_item = pg.PlotDataItem(pen=None, symbol='s', symbolBrush=tangent_color, symbolSize=8)
-        self.tangent_extend_item = pg.PlotDataItem(pen=pg.mkPen(tangent_extend_color, style=QtCore.Qt.PenStyle.DotLine, width=2.0))
+        self.tangent_line_item = segment_item(pen=pg.mkPen(tangent_color, style=QtCore.Qt.PenStyle.SolidLine, width=2.5))
+        self.tangent_point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol='s', brush=tangent_color, size=8)
+        self.tangent_extend_item = segment_item(pen=pg.mkPen(tangent_extend_color, style=QtCore.Qt.PenStyle.DotLine, width=2.0))
 
         self.angle_arc_item = pg.PlotDataItem(pen=pg.mkPen(color=(255, 0, 0, 180), width=2.0))
+        # The arc is the template 0..1 scaled by the angle, computed into the
+        # same buffers on every update
+        self.arc_template = np.linspace(0, 1, 50)
+        self.arc_x = np.empty_like(self.arc_template)
+        self.arc_y = np.empty_like(self.arc_template)
         self.angle_label_item = pg.TextItem(text='α', color='red', anchor=(0.5, 0.5))
         font = QtGui.QFont()
         font.setPointSize(14)
@@ -175,26 +406,64 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
         self.plot_circle.addItem(self.angle_arc_item)
         self.plot_circle.addItem(self.angle_label_item)
 
-        x_vals = np.linspace(0, 2*np.pi, 500)
-        self.sine_curve_item = pg.PlotDataItem(x_vals, np.sin(x_vals), pen=pg.mkPen('purple', width=2))
-        self.cosine_curve_item = pg.PlotDataItem(x_vals, np.cos(x_vals), pen=pg.mkPen('green', width=2))
-        y_tan = np.tan(x_vals)
-        y_tan[:-1][np.abs(np.diff(y_tan)) > 2 * self.tan_limit * 5] = np.nan
-        self.tangent_curve_item = pg.PlotDataItem(x_vals, y_tan, pen=pg.mkPen(tangent_color, width=2), connect='finite')
+        self.tangent_items = [self.tangent_line_item, self.tangent_point_item, self.tangent_extend_item]
+        self.tangent_shown = True
+        self.value_labels = [self.angle_deg_label, self.angle_rad_label, self.sin_label, self.cos_label, self.tan_label]
+        self.shown_texts = (None,) * len(self.value_labels)
+        self.shown_angle_deg = None
+
+    def _setup_function_plots(self):
+        # Sine, cosine and tangent panels; with lazy=True built after the
+        # first paint, so the window and the unit circle show up sooner
+        self.plot_sine = self.win.addPlot(row=0, col=1, title="Sine Function")
+        self.plot_cosine = self.win.addPlot(row=1, col=1, title="Cosine Function")
+        self.plot_tangent = self.win.addPlot(row=2, col=1, title="Tangent Function")
+        tangent_color = QtGui.QColor(165, 42, 42)
+
+        for plot in [self.plot_sine, self.plot_cosine, self.plot_tangent]:
+            plot.setXRange(0, 2 * np.pi)
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            ax = plot.getAxis('bottom')
+            ax.setTicks([MAJOR_TICKS_X])
+            plot.getAxis('left').setLabel('Value', units=None)
+
+        self.plot_sine.setYRange(-1.1, 1.1)
+        self.plot_cosine.setYRange(-1.1, 1.1)
+        self.plot_tangent.setYRange(-self.tan_limit*1.1, self.tan_limit*1.1)
+
+        tan_asymptote_pen = pg.mkPen(color=(180, 180, 180), style=QtCore.Qt.PenStyle.DashLine, width=1)
+        self.tan_asymptote1 = pg.InfiniteLine(pos=np.pi/2, angle=90, pen=tan_asymptote_pen)
+        self.tan_asymptote2 = pg.InfiniteLine(pos=3*np.pi/2, angle=90, pen=tan_asymptote_pen)
+        self.plot_tangent.addItem(self.tan_asymptote1)
+        self.plot_tangent.addItem(self.tan_asymptote2)
+        self.plot_tangent.getViewBox().setLimits(yMin=-self.tan_limit*1.2, yMax=self.tan_limit*1.2)
+
+        # Curves are sampled for the visible x range and resampled on zoom/pan
+        self.sine_curve_item = pg.PlotDataItem(pen=pg.mkPen('purple', width=2))
+        self.cosine_curve_item = pg.PlotDataItem(pen=pg.mkPen('green', width=2))
+        self.tangent_curve_item = pg.PlotDataItem(pen=pg.mkPen(tangent_color, width=2), connect='finite')
+        self.curves = [
+            AdaptiveCurve(self.plot_sine, self.sine_curve_item, np.sin),
+            AdaptiveCurve(self.plot_cosine, self.cosine_curve_item, np.cos),
+            AdaptiveCurve(self.plot_tangent, self.tangent_curve_item, np.tan,
+                          poles=(np.pi / 2, np.pi), clip=self.tan_limit * 100),
+        ]
 
         self.plot_sine.addItem(self.sine_curve_item)
         self.plot_cosine.addItem(self.cosine_curve_item)
         self.plot_tangent.addItem(self.tangent_curve_item)
+        for curve in self.curves:
+            curve.refresh()
 
         common_symbol = 'o'
         common_symbol_size = 9
         line_style = QtCore.Qt.PenStyle.DashLine
-        self.current_sine_point_item = pg.PlotDataItem(pen=None, symbol=common_symbol, symbolBrush='red', symbolSize=common_symbol_size)
-        self.sine_height_line_item = pg.PlotDataItem(pen=pg.mkPen('purple', style=line_style, width=1.5))
-        self.current_cosine_point_item = pg.PlotDataItem(pen=None, symbol=common_symbol, symbolBrush='red', symbolSize=common_symbol_size)
-        self.cosine_height_line_item = pg.PlotDataItem(pen=pg.mkPen('green', style=line_style, width=1.5))
-        self.current_tan_point_item = pg.PlotDataItem(pen=None, symbol=common_symbol, symbolBrush='red', symbolSize=common_symbol_size)
-        self.tan_height_line_item = pg.PlotDataItem(pen=pg.mkPen(tangent_color, style=line_style, width=1.5))
+        self.current_sine_point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol=common_symbol, brush='red', size=common_symbol_size)
+        self.sine_height_line_item = segment_item(pen=pg.mkPen('purple', style=line_style, width=1.5))
+        self.current_cosine_point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol=common_symbol, brush='red', size=common_symbol_size)
+        self.cosine_height_line_item = segment_item(pen=pg.mkPen('green', style=line_style, width=1.5))
+        self.current_tan_point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol=common_symbol, brush='red', size=common_symbol_size)
+        self.tan_height_line_item = segment_item(pen=pg.mkPen(tangent_color, style=line_style, width=1.5))
 
         self.plot_sine.addItem(self.current_sine_point_item)
         self.plot_sine.addItem(self.sine_height_line_item)
@@ -203,11 +472,91 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
         self.plot_tangent.addItem(self.current_tan_point_item)
         self.plot_tangent.addItem(self.tan_height_line_item)
 
+        tangent_markers = [self.current_tan_point_item, self.tan_height_line_item]
+        for item in tangent_markers:
+            item.setVisible(self.tangent_shown)
+        self.tangent_items += tangent_markers
+        self.function_plots_ready = True
+        self._startup_step("function plots")
+
+        # Draw the current angle on the new panels too
+        self.shown_angle_deg = None
+        self._update_visuals(self.current_angle_deg)
+
+
+    def _setup_custom_plot(self, func):
+        # Panel for the user's function, added under the others on the first
+        # Plot. Poles are not known in advance, so the curve is broken where it
+        # jumps, like the tangent curve used to be.
+        self.custom_plot = self.win.addPlot(row=3, col=0, colspan=2)
+        self.custom_plot.setXRange(0, 2 * np.pi)
+        self.custom_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.custom_plot.getAxis('bottom').setTicks([MAJOR_TICKS_X])
+        self.custom_plot.getAxis('left').setLabel('Value', units=None)
+
+        self.custom_curve_item = pg.PlotDataItem(pen=pg.mkPen((30, 100, 200), width=2), connect='finite')
+        self.custom_plot.addItem(self.custom_curve_item)
+        self.custom_curve = AdaptiveCurve(self.custom_plot, self.custom_curve_item, func,
+                                          clip=self.tan_limit * 100, jump=2 * self.tan_limit * 5)
+
+        self.current_custom_point_item = pg.ScatterPlotItem([0], [0], pen=None, symbol='o', brush='red', size=9)
+        self.custom_height_line_item = segment_item(
+            pen=pg.mkPen((30, 100, 200), style=QtCore.Qt.PenStyle.DashLine, width=1.5))
+        self.custom_plot.addItem(self.current_custom_point_item)
+        self.custom_plot.addItem(self.custom_height_line_item)
+
+    def _plot_expression(self):
+        text = self.expression_textbox.text().strip()
+        try:
+            func = compile_expression(text)
+            # Evaluate once before touching the panel, so a function that
+            # fails leaves the previous one in place
+            y = func(np.linspace(0, 2 * np.pi, 512))
+            func(self.current_angle_rad % (2 * np.pi))
+        except ExpressionError as error:
+            self.expression_error_label.setText(str(error))
+            return
+        except Exception as error:
+            self.expression_error_label.setText(f"cannot evaluate: {error}")
+            return
+        self.expression_error_label.setText("")
+
+        if self.custom_plot is None:
+            self._setup_custom_plot(func)
+        self.custom_func = func
+        self.custom_curve.set_func(func)
+        self.custom_plot.setTitle(f"f(x) = {text}")
+
+        # Fit the y axis to one turn, within the tangent panel's range
+        y = y[np.isfinite(y)]
+        limit = self.tan_limit * 1.1
+        if y.size:
+            low, high = max(y.min(), -limit), min(y.max(), limit)
+            if high - low < 1e-9:
+                low, high = low - 1, high + 1
+            self.custom_plot.setYRange(low, high)
+        self._update_custom_marker()
+
+    def _update_custom_marker(self):
+        plot_angle_rad = self.current_angle_rad % (2 * np.pi)
+        value = float(self.custom_func(plot_angle_rad))
+        # Undefined (nan/inf) or right at a pole: no marker, as for tan
+        shown = math.isfinite(value) and abs(value) <= self.custom_curve.clip
+        self.current_custom_point_item.setVisible(shown)
+        self.custom_height_line_item.setVisible(shown)
+        if shown:
+            self.current_custom_point_item.setPos(plot_angle_rad, value)
+            place_segment(self.custom_height_line_item, plot_angle_rad, 0, plot_angle_rad, value)
+
     def _connect_signals(self):
         self.angle_slider.valueChanged.connect(self._slider_changed)
         self.angle_textbox.returnPressed.connect(self._text_submitted)
         self.angle_textbox.editingFinished.connect(self._text_submitted)
         self.reset_button.clicked.connect(self._reset_angle)
+        self.animate_button.toggled.connect(self._toggle_animation)
+        self.speed_spinbox.valueChanged.connect(self.animator.set_speed)
+        self.expression_textbox.returnPressed.connect(self._plot_expression)
+        self.plot_expression_button.clicked.connect(self._plot_expression)
 
     def _slider_changed(self, value):
         angle_deg = value / 10.0
@@ -218,7 +567,7 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
                  self.angle_textbox.setText(new_text)
 
         self.slider_value_label.setText(f"{angle_deg:.1f}")
-        self._update_visuals(angle_deg)
+        self._request_angle(angle_deg)
 
     def _text_submitted(self):
         try:
@@ -234,7 +583,7 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
                 if self.angle_textbox.text() != formatted_angle:
                     self.angle_textbox.setText(formatted_angle)
                 self.slider_value_label.setText(formatted_angle)
-                self._update_visuals(angle_deg)
+                self._request_angle(angle_deg)
             else:
                 self.angle_textbox.setText(f"{self.current_angle_deg:.1f}")
         except ValueError:
@@ -242,91 +591,107 @@ class UnitCircleVisualizerPyQtGraph(QtWidgets.QWidget):
 
     def _set_angle(self, angle_deg):
         angle_deg = float(angle_deg)
+        self.angle_slider.blockSignals(True)
         self.angle_slider.setValue(int(round(angle_deg * 10)))
+        self.angle_slider.blockSignals(False)
         formatted_angle = f"{angle_deg:.1f}"
         self.angle_textbox.setText(formatted_angle)
+        self.slider_value_label.setText(formatted_angle)
+        self._request_angle(angle_deg)
+
+    def _request_angle(self, angle_deg):
+        # Slider, textbox and buttons all redraw through the scheduler
+        self.scheduler.request(angle_deg)
 
     def _reset_angle(self):
         self._set_angle(self.initial_angle_deg)
 
-    def _update_visuals(self, angle_deg):
-        self.current_angle_deg = angle_deg
-        self.current_angle_rad = math.radians(angle_deg)
-
-        cos_a = np.cos(self.current_angle_rad)
-        sin_a = np.sin(self.current_angle_rad)
+    def _toggle_animation(self, checked):
+        if checked:
+            self.animator.speed = self.speed_spinbox.value()
+            self.animator.start(self.current_angle_deg)
+            self.frames_since_report = 0
+        else:
+            self.animator.stop()
+            self.fps_label.setText(self.animator.stats())
 
-        angle_mod_2pi = self.current_angle_rad % (2 * np.pi)
-        is_near_pi_half = math.isclose(angle_mod_2pi, np.pi / 2, abs_tol=1e-8)
-        is_near_3pi_half = math.isclose(angle_mod_2pi, 3 * np.pi / 2, abs_tol=1e-8)
-        is_pole = is_near_pi_half or is_near_3pi_half
+    def _animate_frame(self, angle_deg):
+        self.scheduler.show_now(angle_deg)
+        self.angle_slider.blockSignals(True)
+        self.angle_slider.setValue(int(round(angle_deg * 10)))
+        self.angle_slider.blockSignals(False)
+        self.slider_value_label.setText(f"{angle_deg:.1f}")
 
-        self.angle_line_item.setData([0, cos_a], [0, sin_a])
-        self.point_item.setData([cos_a], [sin_a])
-        self.sin_line_item.setData([cos_a, cos_a], [0, sin_a])
-        self.cos_line_item.setData([0, cos_a], [0, 0])
+        # Refresh the fps readout about once a second
+        self.frames_since_report += 1
+        if self.frames_since_report * self.scheduler.frame_interval >= 1.0:
+            self.frames_since_report = 0
+            self.fps_label.setText(self.animator.stats())
 
-        show_tangent = False
-        tan_text_val = "undefined"
+    def _update_visuals(self, angle_deg):
+        # Lines and markers keep their data and are only moved; labels and
+        # visibility are only touched when they change
+        if angle_deg == self.shown_angle_deg:
+            return
+        self.shown_angle_deg = angle_deg
+        self.current_angle_deg = angle_deg
+        self.current_angle_rad = math.radians(angle_deg)
 
-        if not is_pole and abs(cos_a) > 1e-9:
-            try:
-                tan_a = math.tan(self.current_angle_rad)
-                tan_display = np.clip(tan_a, -self.tan_limit, self.tan_limit)
+        cos_a = math.cos(self.current_angle_rad)
+        sin_a = math.sin(self.current_angle_rad)
+        tan_a, tan_text_val = tangent(self.current_angle_rad, cos_a)
+        show_tangent = tan_a is not None
 
-                self.tangent_line_item.setData([1, 1], [0, tan_display])
-                self.tangent_point_item.setData([1], [tan_display])
-                self.tangent_extend_item.setData([0, 1], [0, tan_display])
+        place_segment(self.angle_line_item, 0, 0, cos_a, sin_a)
+        self.point_item.setPos(cos_a, sin_a)
+        place_segment(self.sin_line_item, cos_a, 0, cos_a, sin_a)
+        place_segment(self.cos_line_item, 0, 0, cos_a, 0)
 
-                show_tangent = True
-                tan_text_val = f"{tan_a:.4f}"
+        if show_tangent:
+            tan_display = min(max(tan_a, -self.tan_limit), self.tan_limit)
+            place_segment(self.tangent_line_item, 1, 0, 1, tan_display)
+            self.tangent_point_item.setPos(1, tan_display)
+            place_segment(self.tangent_extend_item, 0, 0, 1, tan_display)
+
+        np.multiply(self.arc_template, self.current_angle_rad, out=self.arc_x)
+        np.sin(self.arc_x, out=self.arc_y)
+        np.cos(self.arc_x, out=self.arc_x)
+        self.arc_x *= ARC_RADIUS
+        self.arc_y *= ARC_RADIUS
+        self.angle_arc_item.setData(self.arc_x, self.arc_y, skipFiniteCheck=True)
 
-            except OverflowError:
-                tan_text_val = "undefined (Overflow)"
-                show_tangent = False
-        else:
-            tan_text_val = "undefined (≈π/2 + kπ)" if is_pole else "undefined (cos ≈ 0)"
-            show_tangent = False
+        label_angle_rad = self.current_angle_rad / 2.0
+        self.angle_label_item.setPos(LABEL_RADIUS * math.cos(label_angle_rad),
+                                     LABEL_RADIUS * math.sin(label_angle_rad))
 
-        self.tangent_line_item.setVisible(show_tangent)
-        self.tangent_point_item.setVisible(show_tangent)
-        self.tangent_extend_item.setVisible(show_tangent)
+        texts = label_texts(angle_deg, self.current_angle_rad, sin_a, cos_a, tan_text_val)
+        for label, text, shown in zip(self.value_labels, texts, self.shown_texts):
+            if text != shown:
+                label.setText(text)
+        self.shown_texts = texts
 
-        arc_radius = 0.35
-        arc_points = 50
-        theta_arc = np.linspace(0, self.current_angle_rad, arc_points)
-        self.angle_arc_item.setData(arc_radius * np.cos(theta_arc), arc_radius * np.sin(theta_arc))
+        if show_tangent != self.tangent_shown:
+            self.tangent_shown = show_tangent
+            for item in self.tangent_items:
+                item.setVisible(show_tangent)
 
-        label_radius = 0.45
-        label_angle_rad = self.current_angle_rad / 2.0
-        label_x = label_radius * np.cos(label_angle_rad)
-        label_y = label_radius * np.sin(label_angle_rad)
-        self.angle_label_item.setPos(label_x, label_y)
+        if self.custom_plot is not None:
+            self._update_custom_marker()
 
-        sin_color = "purple"
-        cos_color = "green"
-        tan_color = "saddlebrown"
-        self.sin_label.setText(f"Sine: <font color='{sin_color}'>{sin_a:.4f}</font>")
-        self.cos_label.setText(f"Cosine: <font color='{cos_color}'>{cos_a:.4f}</font>")
-        self.tan_label.setText(f"Tangent: <font color='{tan_color}'>{tan_text_val}</font>")
-        self.angle_deg_label.setText(f"Angle [deg]: {angle_deg:.1f}°")
-        self.angle_rad_label.setText(f"Angle [rad]: {self.current_angle_rad:.4f}")
+        if not self.function_plots_ready:
+            return
 
-        plot_angle_rad = angle_mod_2pi
+        plot_angle_rad = self.current_angle_rad % (2 * np.pi)
 
-        self.current_sine_point_item.setData([plot_angle_rad], [sin_a])
-        self.sine_height_line_item.setData([plot_angle_rad, plot_angle_rad], [0, sin_a])
+        self.current_sine_point_item.setPos(plot_angle_rad, sin_a)
+        place_segment(self.sine_height_line_item, plot_angle_rad, 0, plot_angle_rad, sin_a)
 
-        self.current_cosine_point_item.setData([plot_angle_rad], [cos_a])
-        self.cosine_height_line_item.setData([plot_angle_rad, plot_angle_rad], [0, cos_a])
+        self.current_cosine_point_item.setPos(plot_angle_rad, cos_a)
+        place_segment(self.cosine_height_line_item, plot_angle_rad, 0, plot_angle_rad, cos_a)
 
         if show_tangent:
-            tan_a_for_plot = math.tan(self.current_angle_rad)
-            tan_plot_display = np.clip(tan_a_for_plot, -self.tan_limit, self.tan_limit)
-            self.current_tan_point_item.setData([plot_angle_rad], [tan_plot_display])
-            self.tan_height_line_item.setData([plot_angle_rad, plot_angle_rad], [0, tan_plot_display])
-        self.current_tan_point_item.setVisible(show_tangent)
-        self.tan_height_line_item.setVisible(show_tangent)
+            self.current_tan_point_item.setPos(plot_angle_rad, tan_display)
+            place_segment(self.tan_height_line_item, plot_angle_rad, 0, plot_angle_rad, tan_display)
 
 if __name__ == '__main__':
     if hasattr(QtCore.Qt.ApplicationAttribute, 'AA_EnableHighDpiScaling'):
@@ -334,10 +699,64 @@ if __name__ == '__main__':
     if hasattr(QtCore.Qt.ApplicationAttribute, 'AA_UseHighDpiPixmaps'):
         QtWidgets.QApplication.setAttribute(QtCore.Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
 
+    parser = argparse.ArgumentParser(description="Unit circle visualizer")
+    parser.add_argument("--stats", action="store_true",
+                        help="print how many angle updates were drawn, merged or dropped on exit")
+    parser.add_argument("--animate", type=float, nargs="?", const=45.0, metavar="DEG_PER_S",
+                        help="start sweeping the angle right away (default speed 45 deg/s)")
+    parser.add_argument("--opengl", action="store_true", help="draw the plots through an OpenGL viewport")
+    parser.add_argument("--antialias", action="store_true",
+                        help="antialiased curves; looks smoother but costs frame rate")
+    parser.add_argument("--timing", action="store_true",
+                        help="print import, first-paint and full-startup times")
+    parser.add_argument("--no-lazy", dest="lazy", action="store_false",
+                        help="build all plots before showing the window")
+    parser.add_argument("--expr", metavar="TEXT",
+                        help="also plot a function of x, e.g. \"sin(3x)*cos(x)\"")
+    parser.add_argument("--export", metavar="DIR",
+                        help="no window: render the plots at each of --angles into DIR and exit")
+    parser.add_argument("--angles", nargs="+", default=["0:360:15"], metavar="SPEC",
+                        help="angles for --export: numbers and start:stop:step ranges, stop included "
+                             "(default 0:360:15)")
+    parser.add_argument("--format", nargs="+", choices=["png", "svg"], default=["png"],
+                        help="file formats for --export")
+    parser.add_argument("--width", type=int, help="PNG width in pixels for --export")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes for --export, each with its own QApplication")
+    args, qt_args = parser.parse_known_args()
+
+    if args.export:
+        import export
+        try:
+            angles = export.parse_angles(args.angles)
+        except ValueError as error:
+            parser.error(str(error))
+        export.export(angles, args.export, args.format, args.width,
+                      args.workers, antialias=args.antialias, expression=args.expr)
+        sys.exit()
+
+    if args.opengl:
+        try:
+            import OpenGL  # noqa: F401 - pyqtgraph needs PyOpenGL for useOpenGL
+            pg.setConfigOptions(useOpenGL=True)
+        except ImportError:
+            print("PyOpenGL is not installed (pip install PyOpenGL), using the default viewport")
+    pg.setConfigOptions(antialias=args.antialias)
+
     qapp = QtWidgets.QApplication.instance()
     if not qapp:
-        qapp = QtWidgets.QApplication(sys.argv)
-
-    app = UnitCircleVisualizerPyQtGraph()
-
-    sys.exit(qapp.exec())
\ No newline at end of file
+        qapp = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+
+    app = UnitCircleVisualizerPyQtGraph(lazy=args.lazy, print_timing=args.timing)
+    if args.expr:
+        app.expression_textbox.setText(args.expr)
+        app._plot_expression()
+    if args.animate is not None:
+        app.speed_spinbox.setValue(args.animate)
+        app.animate_button.setChecked(True)
+
+    exit_code = qapp.exec()
+    if args.stats:
+        print(app.scheduler.stats())
+        print(app.animator.stats())
+    sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,34 @@
+# trig.py - where tan is undefined, for one angle or for whole arrays
+import math
+import numpy as np
+
+POLE_TOLERANCE = 1e-8  # angle (mod 2π) this close to π/2 or 3π/2 is a pole
+COS_TOLERANCE = 1e-9   # |cos| at or below this counts as zero
+
+
+def tangent(angle_rad, cos_a):
+    # (tan value, label text); the value is None where tan is undefined
+    angle_mod_2pi = angle_rad % (2 * np.pi)
+    is_near_pi_half = math.isclose(angle_mod_2pi, np.pi / 2, abs_tol=POLE_TOLERANCE)
+    is_near_3pi_half = math.isclose(angle_mod_2pi, 3 * np.pi / 2, abs_tol=POLE_TOLERANCE)
+    is_pole = is_near_pi_half or is_near_3pi_half
+
+    if not is_pole and abs(cos_a) > COS_TOLERANCE:
+        try:
+            tan_a = math.tan(angle_rad)
+            return tan_a, f"{tan_a:.4f}"
+        except OverflowError:
+            return None, "undefined (Overflow)"
+    return None, "undefined (≈π/2 + kπ)" if is_pole else "undefined (cos ≈ 0)"
+
+
+def tangent_undefined(angle_rad, cos_a):
+    # Boolean mask, True wherever tangent() gives None. math.isclose's default
+    # rel_tol (1e-9 * 3π/2 at most) never beats abs_tol here, so a plain
+    # distance test is the same check.
+    angle_mod_2pi = np.mod(angle_rad, 2 * np.pi)
+    undefined = np.abs(cos_a) <= COS_TOLERANCE
+    undefined |= np.abs(angle_mod_2pi - np.pi / 2) <= POLE_TOLERANCE
+    undefined |= np.abs(angle_mod_2pi - 3 * np.pi / 2) <= POLE_TOLERANCE
+    undefined |= ~np.isfinite(angle_rad)
+    return undefined
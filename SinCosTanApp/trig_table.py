@@ -0,0 +1,124 @@
+# trig_table.py - angle, radians, sin, cos, tan for huge angle ranges, in chunks
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from trig import tangent_undefined
+
+DTYPE = np.dtype([("angle", np.float64), ("radians", np.float64), ("sin", np.float64),
+                  ("cos", np.float64), ("tan", np.float64)])
+
+
+def sample_count(start, stop, step):
+    # stop is included when the range lands on it
+    return int(np.floor((stop - start) / step + 1e-9)) + 1
+
+
+def fill(table, first, start, step):
+    # Rows first .. first + len(table) of the range. Each angle is computed
+    # from its index, so chunks match whichever process computed them.
+    np.multiply(np.arange(first, first + len(table), dtype=np.float64), step, out=table["angle"])
+    table["angle"] += start
+    np.radians(table["angle"], out=table["radians"])
+    np.sin(table["radians"], out=table["sin"])
+    np.cos(table["radians"], out=table["cos"])
+    np.tan(table["radians"], out=table["tan"])
+    # NaN where the app shows "undefined", with the same tolerances
+    table["tan"][tangent_undefined(table["radians"], table["cos"])] = np.nan
+
+
+def create_npy(path, count):
+    # Writes the header and sizes the file; rows are filled in chunk by chunk
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=(count,))
+    offset = table.offset
+    del table
+    return offset
+
+
+def write_npy_chunk(path, offset, first, count, start, step):
+    # Maps only this chunk's rows, so memory stays at one chunk
+    table = np.memmap(path, dtype=DTYPE, mode="r+", offset=offset + first * DTYPE.itemsize,
+                      shape=(count,))
+    fill(table, first, start, step)
+    table.flush()
+    del table
+    return count
+
+
+def csv_chunk(first, count, start, step, digits):
+    table = np.empty(count, dtype=DTYPE)
+    fill(table, first, start, step)
+    # One % per row is about twice as fast as np.savetxt, same text
+    row = ",".join([f"%.{digits}g"] * len(DTYPE.names)) + "\n"
+    text = "".join(map(row.__mod__, table.tolist()))
+    # sin and cos are never NaN, so this only hits tan
+    return text.replace("nan", "undefined")
+
+
+def run_chunks(tasks, function, workers):
+    # Results in order, with at most 2 chunks per worker in flight, so memory
+    # does not grow with the range
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(function, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a table of angle, radians, sin, cos and tan")
+    parser.add_argument("out", help="table.npy (memory-mapped structured array), table.csv, or - for CSV on stdout")
+    parser.add_argument("--start", type=float, default=0.0, help="first angle [deg]")
+    parser.add_argument("--stop", type=float, default=360.0, help="last angle [deg], included")
+    parser.add_argument("--step", type=float, default=0.1, help="angle step [deg]")
+    parser.add_argument("--chunk", type=int, default=1 << 18, help="rows computed at a time")
+    parser.add_argument("--workers", type=int, default=1, help="processes computing chunks")
+    parser.add_argument("--digits", type=int, default=17, help="significant digits in CSV")
+    args = parser.parse_args()
+    if args.step <= 0:
+        parser.error("--step must be positive")
+    if args.chunk < 1:
+        parser.error("--chunk must be at least 1")
+    if args.stop < args.start:
+        parser.error("--stop must not be below --start")
+
+    count = sample_count(args.start, args.stop, args.step)
+    chunks = [(first, min(args.chunk, count - first)) for first in range(0, count, args.chunk)]
+    log = sys.stderr if args.out == "-" else sys.stdout
+    started = time.perf_counter()
+    done = 0
+
+    if args.out.endswith(".npy"):
+        offset = create_npy(args.out, count)
+        tasks = ((args.out, offset, first, rows, args.start, args.step) for first, rows in chunks)
+        for rows in run_chunks(tasks, write_npy_chunk, args.workers):
+            done += rows
+            print(f"\r{done}/{count} rows", end="", file=log, flush=True)
+    else:
+        tasks = ((first, rows, args.start, args.step, args.digits) for first, rows in chunks)
+        f = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+        try:
+            f.write(",".join(DTYPE.names) + "\n")
+            for (_, rows), text in zip(chunks, run_chunks(tasks, csv_chunk, args.workers)):
+                f.write(text)
+                done += rows
+                print(f"\r{done}/{count} rows", end="", file=log, flush=True)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{count} rows in {elapsed:.1f} s ({count / elapsed / 1e6:.1f} M rows/s)", file=log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# Benchmark suite for Brainroot_Ball and SinCosTanApp.
+#
+#   python benchmarks/run.py            # run and compare with baseline.json
+#   python benchmarks/run.py --save     # run and store the numbers as the new baseline
+#   python benchmarks/run.py -k ball    # only benchmarks whose name contains "ball"
+#   python benchmarks/run.py --memory   # also bytes per instance and peak memory of a few calls
+import argparse
+import gc
+import importlib.util
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Offscreen pygame and Qt, must be set before either is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+sys.path.insert(0, str(ROOT / "Brainroot_Ball"))
+sys.path.insert(1, str(ROOT / "SinCosTanApp"))
+
+BENCHMARKS = {}
+MEMORY = {}
+PEAK = {}
+
+
+def benchmark(name, number):
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+def memory(name):
+    # setup() returns a function creating one instance
+    def register(setup):
+        MEMORY[name] = setup
+        return setup
+    return register
+
+
+def peak_memory(name):
+    # setup() returns a function whose peak allocation while it runs is measured
+    def register(setup):
+        PEAK[name] = setup
+        return setup
+    return register
+
+
+def load_module(name, path):
+    # Both projects have a main.py, so load by path under a unique name
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pygame_screen():
+    import pygame
+    if not pygame.display.get_init():
+        pygame.display.init()
+        pygame.display.set_mode((800, 800))
+    return pygame.Surface((800, 800))
+
+
+@benchmark("ball.Ball.update", number=20000)
+def ball_update():
+    from circle import Circle
+    from ball import Ball
+    ball = Ball(Circle((400, 400), 300), rng=random.Random(0))
+    return ball.update
+
+
+@benchmark("old_main.Ball step", number=20000)
+def old_ball_step():
+    import old_main
+    random.seed(0)
+    ball = old_main.Ball((400, 400), 300, 10, 5, 2, 90, (255, 255, 255), 10, 5)
+
+    def step():
+        ball.calculate_new_position()
+        ball.bounce()
+        ball.update()
+    return step
+
+
+@benchmark("ball.Ball.draw", number=5000)
+def ball_draw():
+    from circle import Circle
+    from ball import Ball
+    screen = pygame_screen()
+    ball = Ball(Circle((400, 400), 300), rng=random.Random(0))
+    ball.size = 40
+    return lambda: ball.draw(screen)
+
+
+@benchmark("circle.Circle.draw", number=500)
+def circle_draw():
+    from circle import Circle
+    screen = pygame_screen()
+    circle = Circle((400, 400), 300)
+    return lambda: circle.draw(screen)
+
+
+@benchmark("raster.BatchRenderer.draw 50k balls", number=5)
+def batch_render():
+    import numpy as np
+    from circle import Circle
+    from swarm import BallSwarm
+    from raster import BatchRenderer
+    screen = pygame_screen()
+    circle = Circle((400, 400), 300)
+    swarm = BallSwarm(circle, 50000, size=3, rng=np.random.default_rng(0))
+    swarm.scatter()
+    raster = BatchRenderer(screen, circle.draw)
+    return lambda: raster.draw(swarm.x, swarm.y, swarm.size, swarm.color)
+
+
+@peak_memory("peak raster.BatchRenderer.draw 2000 r=90 balls")
+def batch_render_large():
+    # Swarm balls end at the stop size, 0.3 of the circle radius
+    import numpy as np
+    from circle import Circle
+    from swarm import BallSwarm
+    from raster import BatchRenderer
+    screen = pygame_screen()
+    circle = Circle((400, 400), 300)
+    swarm = BallSwarm(circle, 2000, size=90, rng=np.random.default_rng(0))
+    swarm.scatter()
+    raster = BatchRenderer(screen, circle.draw)
+    return lambda: raster.draw(swarm.x, swarm.y, swarm.size, swarm.color)
+
+
+def collision_grid(count, grown):
+    import numpy as np
+    from circle import Circle
+    from swarm import BallSwarm
+    from collisions import SpatialGrid
+    swarm = BallSwarm(Circle((400, 400), 300), count, size=3, rng=np.random.default_rng(0))
+    swarm.scatter()
+    # Balls that have grown to the stop size, 0.3 of the circle radius
+    swarm.size[:grown] = 90
+    grid = SpatialGrid()
+
+    def pairs():
+        grid.build(swarm.x, swarm.y, swarm.size)
+        return grid.candidate_pairs()
+    return pairs
+
+
+@benchmark("collisions.SpatialGrid 2000 balls", number=20)
+def collision_grid_uniform():
+    return collision_grid(2000, 0)
+
+
+@benchmark("collisions.SpatialGrid 2000 balls, 20 grown", number=20)
+def collision_grid_mixed():
+    return collision_grid(2000, 20)
+
+
+@benchmark("collisions.SpatialGrid 8000 balls, 1 grown", number=5)
+def collision_grid_mixed_large():
+    return collision_grid(8000, 1)
+
+
+@benchmark("swarm.BallSwarm 200 colliding balls until full", number=1)
+def colliding_swarm_until_full():
+    # Also a check: colliding balls must still fill the circle and stop
+    import numpy as np
+    from circle import Circle
+    from swarm import BallSwarm
+    circle = Circle((400, 400), 300)
+
+    def run():
+        swarm = BallSwarm(circle, 200, rng=np.random.default_rng(0), collide=True)
+        for _ in range(20000):
+            if swarm.is_full():
+                return
+            swarm.update()
+        raise AssertionError("colliding swarm not full after 20000 frames")
+    return run
+
+
+@memory("memory ball.Ball")
+def ball_memory():
+    from circle import Circle
+    from ball import Ball
+    circle = Circle((400, 400), 300)
+    rng = random.Random(0)
+    return lambda: Ball(circle, rng=rng)
+
+
+@memory("memory old_main.Ball")
+def old_ball_memory():
+    import old_main
+    random.seed(0)
+    return lambda: old_main.Ball((400, 400), 300, 10, 5, 2, 90, (255, 255, 255), 10, 5)
+
+
+def unit_circle_app():
+    from PyQt6 import QtWidgets
+    qapp = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    app_module = load_module("sincostan_main", ROOT / "SinCosTanApp" / "main.py")
+    return qapp, app_module.UnitCircleVisualizerPyQtGraph()
+
+
+@benchmark("UnitCircleVisualizerPyQtGraph._update_visuals", number=361)
+def unit_circle_update_visuals():
+    qapp, app = unit_circle_app()
+    # Sweep the whole 0-360 range in 1 deg steps
+    angles = itertools.cycle([float(angle) for angle in range(361)])
+    return lambda: app._update_visuals(next(angles))
+
+
+@benchmark("UnitCircleVisualizerPyQtGraph update + repaint", number=361)
+def unit_circle_update_repaint():
+    # Latency until the new angle is on screen: update plus the repaint it causes
+    qapp, app = unit_circle_app()
+    qapp.processEvents()
+    angles = itertools.cycle([angle / 10 for angle in range(0, 3601, 7)])
+
+    def update():
+        app._update_visuals(next(angles))
+        qapp.processEvents()
+    return update
+
+
+def measure(setup, number, repeat, min_time):
+    func = setup()
+    func()  # warm-up
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Grow the loop until one round is long enough to time reliably
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= min_time:
+                break
+            number *= 2
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def measure_memory(setup, count=1000):
+    # Bytes allocated per live instance; shared objects (circle, rng) are
+    # created by setup() before tracing starts
+    create = setup()
+    create()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [create() for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del instances
+    return {"bytes": allocated / count}
+
+
+def measure_peak(setup):
+    func = setup()
+    func()  # warm-up, so caches filled on the first call are not counted
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"peak": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brainroot_Ball / SinCosTanApp benchmark suite")
+    parser.add_argument("-k", dest="filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum duration of one timed round [s]")
+    parser.add_argument("--save", action="store_true", help=f"store results as the baseline ({BASELINE.name})")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="report a regression when min time grows by more than this fraction")
+    parser.add_argument("--memory", action="store_true", help="also measure bytes per instance")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<48} {'min [us]':>10} {'median [us]':>12} {'baseline':>10} {'change':>8}")
+    for name, (setup, number) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        result = measure(setup, number, args.repeat, args.min_time)
+        results[name] = result
+        line = f"{name:<48} {result['min'] * 1e6:>10.2f} {result['median'] * 1e6:>12.2f}"
+        if name in baseline:
+            change = result["min"] / baseline[name]["min"] - 1
+            line += f" {baseline[name]['min'] * 1e6:>10.2f} {change:>+8.1%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.memory:
+        print(f"\n{'instance size':<48} {'bytes':>10} {'baseline':>23} {'change':>8}")
+        for name, setup in MEMORY.items():
+            if args.filter not in name:
+                continue
+            result = measure_memory(setup)
+            results[name] = result
+            line = f"{name:<48} {result['bytes']:>10.0f}"
+            if name in baseline:
+                change = result["bytes"] / baseline[name]["bytes"] - 1
+                line += f" {baseline[name]['bytes']:>23.0f} {change:>+8.1%}"
+            print(line)
+
+        print(f"\n{'peak memory':<48} {'MB':>10} {'baseline':>23} {'change':>8}")
+        for name, setup in PEAK.items():
+            if args.filter not in name:
+                continue
+            result = measure_peak(setup)
+            results[name] = result
+            line = f"{name:<48} {result['peak'] / 1e6:>10.1f}"
+            if name in baseline:
+                change = result["peak"] / baseline[name]["peak"] - 1
+                line += f" {baseline[name]['peak'] / 1e6:>23.1f} {change:>+8.1%}"
+                if change > args.tolerance:
+                    regressions.append(name)
+                    line += "  REGRESSION"
+            print(line)
+
+    if args.save:
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {BASELINE}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()